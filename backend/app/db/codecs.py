@@ -0,0 +1,148 @@
+import json
+import struct
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- On-disk encodings for the local store ---
+#
+# A codec turns snapshots (a list of documents) and log records into bytes.
+# Log records are framed so a reader can find where each one ends and leave
+# a torn, half-written record at the tail alone: the JSON codecs write one
+# record per line, msgpack prefixes each record with its length.
+#
+# ``json`` is the original pretty-printed format. ``orjson`` writes the same
+# JSON compactly and much faster, so a store can switch between the two
+# without migrating. ``msgpack`` is binary, and unlike the JSON codecs it
+# keeps datetimes as datetimes instead of turning them into strings.
+
+
+class JsonCodec:
+    name = "json"
+    snapshot_suffix = ".json"
+    log_suffix = ".log"
+    # Whether datetimes come back as datetimes rather than strings.
+    native_datetimes = False
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=str).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+    def dump_snapshot(self, docs: List[Dict[str, Any]]) -> bytes:
+        return json.dumps(docs, indent=2, default=str).encode("utf-8")
+
+    def load_snapshot(self, data: bytes) -> List[Dict[str, Any]]:
+        return self.decode(data)
+
+    def frame(self, payload: bytes) -> bytes:
+        # Compact JSON never contains a raw newline.
+        return payload + b"\n"
+
+    def unframe(self, data: bytes) -> Tuple[List[Optional[bytes]], int]:
+        """Split ``data`` into record payloads; return them and the bytes consumed.
+
+        A partial record at the end is not consumed. Blank lines come back as
+        ``None`` so callers can skip them.
+        """
+        end = data.rfind(b"\n") + 1
+        lines = data[:end].split(b"\n")[:-1]
+        return [line.strip() or None for line in lines], end
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as exc:
+            raise RuntimeError("orjson is required for LOCAL_DB_CODEC=orjson") from exc
+        self._orjson = orjson
+        # Datetimes go through str() like the json codec so both write the
+        # same strings and sort the same way.
+        self._options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def encode(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=str, option=self._options)
+
+    def decode(self, payload: bytes) -> Any:
+        return self._orjson.loads(payload)
+
+    def dump_snapshot(self, docs: List[Dict[str, Any]]) -> bytes:
+        return self.encode(docs)
+
+
+_DATETIME_EXT = 1
+_LENGTH = struct.Struct(">I")
+
+
+class MsgpackCodec:
+    name = "msgpack"
+    snapshot_suffix = ".msgpack"
+    log_suffix = ".msgpack.log"
+    native_datetimes = True
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as exc:
+            raise RuntimeError("msgpack is required for LOCAL_DB_CODEC=msgpack") from exc
+        self._msgpack = msgpack
+
+    def _default(self, value: Any) -> Any:
+        if isinstance(value, datetime):
+            # ISO text keeps naive datetimes naive and preserves the offset.
+            return self._msgpack.ExtType(_DATETIME_EXT, value.isoformat().encode("utf-8"))
+        return str(value)
+
+    @staticmethod
+    def _ext_hook(code: int, data: bytes) -> Any:
+        if code == _DATETIME_EXT:
+            return datetime.fromisoformat(data.decode("utf-8"))
+        raise ValueError(f"Unknown msgpack extension type: {code}")
+
+    def encode(self, obj: Any) -> bytes:
+        return self._msgpack.packb(obj, default=self._default, use_bin_type=True, datetime=False)
+
+    def decode(self, payload: bytes) -> Any:
+        try:
+            return self._msgpack.unpackb(payload, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+        except self._msgpack.UnpackException as exc:
+            # Report corrupt data as ValueError like the JSON decoders do.
+            raise ValueError(str(exc)) from exc
+
+    def dump_snapshot(self, docs: List[Dict[str, Any]]) -> bytes:
+        return self.encode(docs)
+
+    def load_snapshot(self, data: bytes) -> List[Dict[str, Any]]:
+        return self.decode(data)
+
+    def frame(self, payload: bytes) -> bytes:
+        return _LENGTH.pack(len(payload)) + payload
+
+    def unframe(self, data: bytes) -> Tuple[List[Optional[bytes]], int]:
+        payloads: List[Optional[bytes]] = []
+        offset = 0
+        while offset + _LENGTH.size <= len(data):
+            (length,) = _LENGTH.unpack_from(data, offset)
+            end = offset + _LENGTH.size + length
+            if end > len(data):
+                break
+            payloads.append(data[offset + _LENGTH.size:end])
+            offset = end
+        return payloads, offset
+
+
+CODECS = {
+    "json": JsonCodec,
+    "orjson": OrjsonCodec,
+    "msgpack": MsgpackCodec,
+}
+
+
+def get_codec(name: str):
+    codec = CODECS.get(name.strip().lower())
+    if codec is None:
+        raise ValueError(f"Unknown local store codec {name!r}; expected one of {', '.join(CODECS)}")
+    return codec()
@@ -0,0 +1,127 @@
+"""Convert the local store to another codec.
+
+Run from ``backend/`` with the API stopped::
+
+    python -m app.db.migrate --to msgpack
+
+Every collection found in the data directory, plus any only present in the
+legacy ``local_data.json``, is folded and written in the target codec. The
+source files are left in place; delete them once ``LOCAL_DB_CODEC`` points
+at the new codec and the API has been checked.
+
+A codec that keeps datetimes (msgpack) gets the known timestamp fields
+converted from the strings the JSON codecs stored, so old and new documents
+sort the same way.
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.db.codecs import CODECS, get_codec
+from app.db.mongodb import CODEC, DATA_DIR, DB_FILE, LocalLogStore
+from app.services.timestamps import as_datetime
+
+TIMESTAMP_FIELDS = ("created_at", "updated_at", "generated_at", "run_created_at")
+
+
+def _store_files(store: LocalLogStore) -> List[Path]:
+    return [store.snapshot_file, store.log_file, store.compacting_file, store.pending_file]
+
+
+def _size(store: LocalLogStore) -> int:
+    return sum(p.stat().st_size for p in _store_files(store) if p.exists())
+
+
+def _collection_names(data_dir: Path, codec, legacy_file: Optional[Path]) -> List[str]:
+    names = set()
+    if data_dir.exists():
+        for path in data_dir.iterdir():
+            for suffix in (codec.snapshot_suffix, codec.log_suffix):
+                name = path.name[: -len(suffix)]
+                # Dotted names belong to another codec's files.
+                if path.name.endswith(suffix) and name and "." not in name:
+                    names.add(name)
+    if legacy_file is not None and legacy_file.exists():
+        try:
+            with open(legacy_file, "r") as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError:
+            legacy = {}
+        if isinstance(legacy, dict):
+            names.update(legacy)
+    return sorted(names)
+
+
+def _with_datetimes(doc: Dict[str, Any]) -> Dict[str, Any]:
+    converted = dict(doc)
+    for field in TIMESTAMP_FIELDS:
+        value = as_datetime(doc.get(field))
+        if value is not None:
+            converted[field] = value
+    return converted
+
+
+def _timed_load(store: LocalLogStore) -> float:
+    start = time.perf_counter()
+    store.load()
+    return (time.perf_counter() - start) * 1000
+
+
+def migrate(source_name: str, target_name: str, data_dir: Path, legacy_file: Optional[Path], force: bool) -> None:
+    source_codec = get_codec(source_name)
+    target_codec = get_codec(target_name)
+    same_files = (source_codec.snapshot_suffix, source_codec.log_suffix) == (
+        target_codec.snapshot_suffix,
+        target_codec.log_suffix,
+    )
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    for name in _collection_names(data_dir, source_codec, legacy_file):
+        source = LocalLogStore(data_dir / f"{name}{source_codec.snapshot_suffix}", legacy_file=legacy_file, codec=source_codec)
+        source_ms = _timed_load(source)
+        source_bytes = _size(source)
+        docs = source.load()
+        if target_codec.native_datetimes and not source_codec.native_datetimes:
+            docs = [_with_datetimes(doc) for doc in docs]
+
+        target_file = data_dir / f"{name}{target_codec.snapshot_suffix}"
+        if same_files:
+            target = LocalLogStore(target_file, legacy_file=legacy_file, codec=target_codec)
+            target.rewrite()
+        else:
+            target = LocalLogStore(target_file, codec=target_codec)
+            existing = [p for p in _store_files(target) if p.exists()]
+            if existing and not force:
+                print(f"{name}: skipped, {target_file.name} already exists (use --force to overwrite)")
+                continue
+            for path in existing:
+                path.unlink()
+            tmp_file = Path(f"{target_file}.{os.getpid()}.tmp")
+            target._write_snapshot(docs, tmp_file)
+            os.replace(tmp_file, target_file)
+
+        fresh = LocalLogStore(target_file, codec=target_codec)
+        target_ms = _timed_load(fresh)
+        print(
+            f"{name}: {len(docs)} documents, "
+            f"{source_bytes / 1024:.1f} KiB -> {_size(fresh) / 1024:.1f} KiB, "
+            f"load {source_ms:.1f} ms -> {target_ms:.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--to", required=True, choices=sorted(CODECS), help="codec to write")
+    parser.add_argument("--from", dest="source", default=CODEC, choices=sorted(CODECS), help="codec to read (default: LOCAL_DB_CODEC)")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--legacy-file", type=Path, default=DB_FILE, help="single-file store to seed missing collections from")
+    parser.add_argument("--force", action="store_true", help="overwrite existing target files")
+    args = parser.parse_args()
+    migrate(args.source, args.to, args.data_dir, args.legacy_file, args.force)
+
+
+if __name__ == "__main__":
+    main()
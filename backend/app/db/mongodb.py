@@ -1,127 +1,735 @@
 import os
 import json
 import asyncio
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-# from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient
 
+from app.db.codecs import get_codec
+from app.db.query import (
+    AsyncCollection,
+    SortSpec,
+    WriteOp,
+    WriteTarget,
+    apply_write,
+    is_operator,
+    matches,
+    new_write_counts,
+    project,
+    sort_documents,
+)
+from app.db.sqlite import SqliteCollection, SqliteDatabase
 
-# _client: AsyncIOMotorClient | None = None
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
 
-# def get_client() -> AsyncIOMotorClient:
-#     global _client
-#     if _client is None:
-#         mongo_uri = os.getenv("MONGODB_URI", "")
-#         # Set a short server selection timeout so we fail fast if MongoDB is unavailable
-#         _client = AsyncIOMotorClient(
-#             mongo_uri,
-#             serverSelectionTimeoutMS=5000,  # 5 seconds
-#             connectTimeoutMS=5000,
-#         )
-#     return _client
+_client: AsyncIOMotorClient | None = None
 
 
-# def get_database():
-#     db_name = os.getenv("MONGODB_DB", "genznews")
-#     return get_client()[db_name]
+def get_client() -> AsyncIOMotorClient:
+    global _client
+    if _client is None:
+        mongo_uri = os.getenv("MONGODB_URI", "")
+        if mongo_uri.startswith("mongomock://"):
+            # In-process stand-in for tests and offline development
+            try:
+                from mongomock_motor import AsyncMongoMockClient
+            except ImportError as exc:
+                raise RuntimeError("mongomock-motor is required for mongomock:// URIs") from exc
+            _client = AsyncMongoMockClient()
+            return _client
+        # Set a short server selection timeout so we fail fast if MongoDB is unavailable
+        _client = AsyncIOMotorClient(
+            mongo_uri,
+            serverSelectionTimeoutMS=5000,  # 5 seconds
+            connectTimeoutMS=5000,
+            maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+            minPoolSize=int(os.getenv("MONGODB_MIN_POOL_SIZE", "5")),
+            maxIdleTimeMS=int(os.getenv("MONGODB_MAX_IDLE_MS", "60000")),
+            waitQueueTimeoutMS=int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+        )
+    return _client
+
+
+def close_client() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def get_mongo_database():
+    db_name = os.getenv("MONGODB_DB", "genznews")
+    return get_client()[db_name]
 
 
 # --- Local JSON File Storage Implementation ---
+#
+# Each collection lives in its own log-structured store under ``local_data/``:
+# ``<name>.json`` is a snapshot and every write appends one record to
+# ``<name>.log`` (``LOCAL_DB_CODEC`` picks the encoding, see ``codecs.py``). The folded state is kept in memory, and once the log grows
+# past a threshold a background compaction folds it back into a fresh
+# snapshot. A collection missing from ``local_data/`` is seeded from the
+# legacy single-file ``local_data.json`` the first time it is opened.
+#
+# Compaction renames the live log to ``.compacting`` so writers can keep
+# appending to a new log and folds it into a temp file. Under the lock it then
+# moves the result to ``.new``, deletes the ``.compacting`` log and promotes
+# ``.new``; ``_recover`` uses that ordering to finish or discard a compaction
+# interrupted by a crash, and the next compaction folds any ``.compacting``
+# log that was left behind.
+#
+# File I/O runs on a small dedicated thread pool so the event loop never
+# blocks on disk, and writes to one collection are serialized by an asyncio
+# lock so queued writers don't pile up in the pool.
 
-DB_FILE = Path(__file__).resolve().parents[2] / "local_data.json"
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+DB_FILE = BACKEND_DIR / "local_data.json"
+DATA_DIR = Path(os.getenv("LOCAL_DB_DIR", str(BACKEND_DIR / "local_data")))
+COMPACT_THRESHOLD = int(os.getenv("LOCAL_DB_COMPACT_THRESHOLD", "200"))
+CODEC = os.getenv("LOCAL_DB_CODEC", "json")
 
-class LocalJsonCollection:
-    def __init__(self, name: str, db_file: Path):
-        self.name = name
-        self.db_file = db_file
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LOCAL_DB_IO_THREADS", "4")),
+    thread_name_prefix="local-db",
+)
+
+
+class _HashIndex:
+    """Maps one field's value to the documents holding it.
 
-    def _load_data(self) -> Dict[str, List[Dict[str, Any]]]:
-        if not self.db_file.exists():
-            return {}
+    Documents missing the field or holding an unhashable value are left out,
+    so lookups for ``None`` or unhashable values report that they cannot be
+    answered and the caller falls back to a scan.
+    """
+
+    def __init__(self, field: str, unique: bool = False):
+        self.field = field
+        self.unique = unique
+        self._buckets: Dict[Any, List[Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _hashable(value: Any) -> bool:
         try:
-            with open(self.db_file, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-
-    def _save_data(self, data: Dict[str, List[Dict[str, Any]]]):
-        with open(self.db_file, "w") as f:
-            json.dump(data, f, indent=2, default=str)
-
-    async def find_one(self, filter: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        # Simulate async
-        await asyncio.sleep(0)
-        data = self._load_data()
-        collection_data = data.get(self.name, [])
-        
-        for doc in collection_data:
-            if all(doc.get(k) == v for k, v in filter.items()):
-                return doc
+            hash(value)
+        except TypeError:
+            return False
+        return True
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        value = doc.get(self.field)
+        if value is not None and self._hashable(value):
+            self._buckets.setdefault(value, []).append(doc)
+
+    def remove(self, doc: Dict[str, Any]) -> None:
+        value = doc.get(self.field)
+        if value is None or not self._hashable(value):
+            return
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return
+        bucket[:] = [other for other in bucket if other is not doc]
+        if not bucket:
+            del self._buckets[value]
+
+    def lookup(self, value: Any) -> Optional[List[Dict[str, Any]]]:
+        if value is None or not self._hashable(value):
+            return None
+        return self._buckets.get(value, [])
+
+    def has_duplicates(self) -> bool:
+        return any(len(bucket) > 1 for bucket in self._buckets.values())
+
+
+class _StoreState:
+    """Folded documents of one collection plus the hash indexes over them.
+
+    There is always a unique ``_id`` index; further indexes come from the
+    specs registered through ``create_index``. Log records address documents
+    by position in ``docs``, which replay reproduces exactly, so a record
+    never has to re-run the query that produced it.
+    """
+
+    def __init__(self, docs: List[Dict[str, Any]], index_specs: Dict[str, bool]):
+        self.docs = docs
+        self._positions = {id(doc): i for i, doc in enumerate(docs)}
+        specs = {"_id": True, **index_specs}
+        self._indexes = {field: self._build(field, unique) for field, unique in specs.items()}
+
+    def _build(self, field: str, unique: bool) -> _HashIndex:
+        index = _HashIndex(field, unique)
+        for doc in self.docs:
+            index.add(doc)
+        return index
+
+    def add_index(self, field: str, unique: bool) -> None:
+        index = self._build(field, unique)
+        if unique and index.has_duplicates():
+            raise ValueError(f"Duplicate key error: cannot create unique index on {field}")
+        self._indexes[field] = index
+
+    def _lookup(self, index: _HashIndex, condition: Any) -> Optional[List[Dict[str, Any]]]:
+        if not is_operator(condition):
+            return index.lookup(condition)
+        if set(condition) != {"$in"}:
+            return None
+        found: Dict[int, Dict[str, Any]] = {}
+        for value in condition["$in"]:
+            bucket = index.lookup(value)
+            if bucket is None:
+                return None
+            for doc in bucket:
+                found[id(doc)] = doc
+        return list(found.values())
+
+    def find(self, filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+        candidates: Optional[List[Dict[str, Any]]] = None
+        for field, condition in filter.items():
+            index = self._indexes.get(field)
+            bucket = self._lookup(index, condition) if index is not None else None
+            if bucket is not None and (candidates is None or len(bucket) < len(candidates)):
+                candidates = bucket
+        if candidates is None:
+            candidates = self.docs
+        return [doc for doc in candidates if matches(doc, filter)]
+
+    def find_first(self, filter: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        found = self.find(filter)
+        return found[0] if found else None
+
+    def positions(self, docs: List[Dict[str, Any]]) -> List[int]:
+        return sorted(self._positions[id(doc)] for doc in docs)
+
+    def conflict(self, doc: Dict[str, Any], ignore: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Return the first unique field whose value ``doc`` would duplicate."""
+        for field, index in self._indexes.items():
+            if not index.unique:
+                continue
+            bucket = index.lookup(doc.get(field))
+            if bucket and any(other is not ignore for other in bucket):
+                return field
         return None
 
-    async def insert_one(self, document: Dict[str, Any]):
-        await asyncio.sleep(0)
-        data = self._load_data()
-        if self.name not in data:
-            data[self.name] = []
-        
-        # Simple duplicate check on _id if present
-        if "_id" in document:
-            for doc in data[self.name]:
-                if doc.get("_id") == document["_id"]:
-                    raise ValueError(f"Duplicate key error: {document['_id']}")
-
-        data[self.name].append(document)
-        self._save_data(data)
-        return type('InsertOneResult', (object,), {"inserted_id": document.get("_id")})()
-
-    async def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
-        await asyncio.sleep(0)
-        data = self._load_data()
-        if self.name not in data:
-            data[self.name] = []
-        
-        collection_data = data[self.name]
-        match_idx = -1
-        
-        for i, doc in enumerate(collection_data):
-            if all(doc.get(k) == v for k, v in filter.items()):
-                match_idx = i
-                break
-        
-        if match_idx != -1:
-            # Update existing
-            doc = collection_data[match_idx]
-            if "$set" in update:
-                for k, v in update["$set"].items():
-                    doc[k] = v
-            # Save back
-            collection_data[match_idx] = doc
-            self._save_data(data)
-            return type('UpdateResult', (object,), {"modified_count": 1, "upserted_id": None})()
-        
-        elif upsert:
-            # Insert new
-            new_doc = filter.copy()
-            if "$set" in update:
-                new_doc.update(update["$set"])
-            
-            collection_data.append(new_doc)
-            self._save_data(data)
-            return type('UpdateResult', (object,), {"modified_count": 0, "upserted_id": new_doc.get("_id")})()
-        
-        return type('UpdateResult', (object,), {"modified_count": 0, "upserted_id": None})()
+    def unique_fields(self) -> set:
+        return {field for field, index in self._indexes.items() if index.unique}
+
+    def insert(self, doc: Dict[str, Any]) -> None:
+        self._positions[id(doc)] = len(self.docs)
+        self.docs.append(doc)
+        for index in self._indexes.values():
+            index.add(doc)
+
+    def set_fields(self, doc: Dict[str, Any], fields: Dict[str, Any]) -> None:
+        touched = [index for field, index in self._indexes.items() if field in fields]
+        for index in touched:
+            index.remove(doc)
+        doc.update(fields)
+        for index in touched:
+            index.add(doc)
+
+    def delete(self, positions: List[int]) -> None:
+        doomed = {id(self.docs[i]) for i in positions}
+        for i in positions:
+            for index in self._indexes.values():
+                index.remove(self.docs[i])
+        self.docs[:] = [doc for doc in self.docs if id(doc) not in doomed]
+        self._positions = {id(doc): i for i, doc in enumerate(self.docs)}
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        op = record.get("op")
+        if op == "insert":
+            self.insert(record["doc"])
+        elif op == "update":
+            if "at" in record:
+                targets = [self.docs[i] for i in record["at"]]
+            else:
+                # Logs written before positional records carried the filter.
+                first = self.find_first(record["filter"])
+                targets = [first] if first is not None else []
+            for doc in targets:
+                self.set_fields(doc, record["set"])
+        elif op == "delete":
+            self.delete(record["at"])
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class _LogBatch(WriteTarget):
+    """Writes of one ``LocalLogStore.bulk_write`` batch.
+
+    Each write is checked against the resident state, applied to it and
+    encoded as a log line; targets are the resident documents.
+    """
+
+    def __init__(self, state: _StoreState, codec: Any):
+        self.state = state
+        self.codec = codec
+        self.lines: List[bytes] = []
+
+    def _check_unique(self, doc: Dict[str, Any], ignore: Optional[Dict[str, Any]] = None) -> None:
+        field = self.state.conflict(doc, ignore=ignore)
+        if field is not None:
+            raise ValueError(f"Duplicate key error: {doc[field]}")
+
+    def _log(self, record: Dict[str, Any]) -> None:
+        payload = self.codec.encode(record)
+        # Apply the decoded record so the cache matches what a replay yields.
+        self.state.apply(self.codec.decode(payload))
+        self.lines.append(self.codec.frame(payload))
+
+    def select(self, filter: Dict[str, Any], many: bool) -> List[Dict[str, Any]]:
+        if many:
+            return self.state.find(filter)
+        first = self.state.find_first(filter)
+        return [first] if first is not None else []
+
+    def insert(self, doc: Dict[str, Any]) -> None:
+        self._check_unique(doc)
+        self._log({"op": "insert", "doc": doc})
+
+    def update(self, targets: List[Dict[str, Any]], fields: Dict[str, Any]) -> None:
+        for target in targets:
+            self._check_unique({**target, **fields}, ignore=target)
+        if len(targets) > 1 and self.state.unique_fields() & set(fields):
+            raise ValueError("Duplicate key error: update_many would repeat a unique value")
+        # Only the changed fields are logged; replay re-applies them in order.
+        self._log({"op": "update", "at": self.state.positions(targets), "set": fields})
+
+    def delete(self, targets: List[Dict[str, Any]]) -> None:
+        self._log({"op": "delete", "at": self.state.positions(targets)})
+
+
+class LocalLogStore:
+    """Snapshot plus append-only log for one collection.
+
+    The folded state stays resident between calls. Every access stats the
+    snapshot and log files: if only the log grew, the new tail is replayed;
+    if anything else changed (another worker compacted, a file was replaced)
+    the state is reloaded from disk.
+    """
+
+    def __init__(
+        self,
+        snapshot_file: Path,
+        compact_threshold: int = COMPACT_THRESHOLD,
+        legacy_file: Optional[Path] = None,
+        codec: Any = None,
+    ):
+        self.codec = codec if codec is not None else get_codec("json")
+        self.name = snapshot_file.name[: -len(self.codec.snapshot_suffix)]
+        base = snapshot_file.parent / self.name
+        self.snapshot_file = snapshot_file
+        self.log_file = Path(f"{base}{self.codec.log_suffix}")
+        self.compacting_file = Path(f"{self.log_file}.compacting")
+        self.pending_file = Path(f"{snapshot_file}.new")
+        self.lock_file = Path(f"{base}.lock")
+        self.compact_lock_file = Path(f"{base}.compact.lock")
+        self.legacy_file = legacy_file
+        self.compact_threshold = compact_threshold
+        self.write_lock = asyncio.Lock()
+        self._lock = threading.RLock()
+        self._compact_mutex = threading.Lock()
+        self._compacting = False
+        self._log_records = 0
+        self._index_specs: Dict[str, bool] = {}
+        self._state: Optional[_StoreState] = None
+        self._snapshot_sig: Optional[Tuple[int, int, int]] = None
+        self._compacting_sig: Optional[Tuple[int, int, int]] = None
+        self._log_sig: Optional[Tuple[int, int, int]] = None
+        self._log_offset = 0
+
+    @contextmanager
+    def _locked(self):
+        # The thread lock serializes this process, flock serializes workers.
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_file, "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _compaction_guard(self):
+        """Held for a whole compaction; yields False if one is already running.
+
+        A ``.compacting`` file is only stale when nobody holds this, which is
+        how a compaction that died is told apart from one in progress.
+        """
+        if not self._compact_mutex.acquire(blocking=False):
+            yield False
+            return
+        try:
+            if fcntl is None:
+                yield True
+                return
+            self.compact_lock_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.compact_lock_file, "a") as lock:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        finally:
+            self._compact_mutex.release()
+
+    def _tmp_file(self) -> Path:
+        return Path(f"{self.snapshot_file}.{os.getpid()}.tmp")
+
+    def _write_snapshot(self, docs: List[Dict[str, Any]], path: Path) -> None:
+        with open(path, "wb") as f:
+            f.write(self.codec.dump_snapshot(docs))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _seed_from_legacy(self) -> None:
+        if self.legacy_file is None or not self.legacy_file.exists():
+            return
+        if any(p.exists() for p in (self.snapshot_file, self.log_file, self.compacting_file, self.pending_file)):
+            return
+        try:
+            with open(self.legacy_file, "r") as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError:
+            return
+        docs = legacy.get(self.name) if isinstance(legacy, dict) else None
+        if not docs:
+            return
+        tmp_file = self._tmp_file()
+        self._write_snapshot(docs, tmp_file)
+        os.replace(tmp_file, self.snapshot_file)
+
+    def _recover(self) -> None:
+        if self.compacting_file.exists():
+            # Crashed before the folded log was dropped: the next compaction
+            # folds the leftover log again.
+            if self.pending_file.exists():
+                self.pending_file.unlink()
+        elif self.pending_file.exists():
+            # Crashed after the folded log was dropped: the snapshot is ready.
+            os.replace(self.pending_file, self.snapshot_file)
+
+    def _read_snapshot(self) -> List[Dict[str, Any]]:
+        if not self.snapshot_file.exists():
+            return []
+        try:
+            with open(self.snapshot_file, "rb") as f:
+                return self.codec.load_snapshot(f.read())
+        except ValueError:
+            return []
+
+    def _replay(self, state: _StoreState, log_file: Path, offset: int = 0) -> Tuple[int, int]:
+        """Apply complete log records after ``offset``; return (records, new offset)."""
+        if not log_file.exists():
+            return 0, offset
+        with open(log_file, "rb") as f:
+            f.seek(offset)
+            # A partial record at the tail is not consumed.
+            payloads, consumed = self.codec.unframe(f.read())
+        count = 0
+        for payload in payloads:
+            if payload is None:
+                continue
+            try:
+                record = self.codec.decode(payload)
+            except ValueError:
+                # A record mangled by a crash mid-append is dropped.
+                continue
+            state.apply(record)
+            count += 1
+        return count, offset + consumed
+
+    def _reload(self) -> None:
+        self._snapshot_sig = _file_signature(self.snapshot_file)
+        self._compacting_sig = _file_signature(self.compacting_file)
+        self._log_sig = _file_signature(self.log_file)
+        state = _StoreState(self._read_snapshot(), self._index_specs)
+        # A leftover log still being folded counts towards the next compaction.
+        leftover, _ = self._replay(state, self.compacting_file)
+        self._log_records, self._log_offset = self._replay(state, self.log_file)
+        self._log_records += leftover
+        self._state = state
+
+    def _refresh(self) -> _StoreState:
+        # Caller holds the lock.
+        if self._state is None:
+            self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            self._seed_from_legacy()
+        self._recover()
+        log_sig = _file_signature(self.log_file)
+        unchanged = (
+            self._state is not None
+            and _file_signature(self.snapshot_file) == self._snapshot_sig
+            and _file_signature(self.compacting_file) == self._compacting_sig
+        )
+        if unchanged and log_sig == self._log_sig:
+            return self._state
+        same_log = log_sig is not None and (
+            self._log_sig is None or self._log_sig[0] == log_sig[0]
+        )
+        if unchanged and same_log and log_sig[2] >= self._log_offset:
+            count, self._log_offset = self._replay(self._state, self.log_file, self._log_offset)
+            self._log_records += count
+            self._log_sig = log_sig
+            return self._state
+        self._reload()
+        return self._state
+
+    def invalidate(self) -> None:
+        """Drop the resident state so the next access reloads from disk."""
+        with self._lock:
+            self._state = None
+
+    def load(self) -> List[Dict[str, Any]]:
+        with self._locked():
+            return self._refresh().docs
+
+    def _write_lines(self, lines: List[bytes]) -> None:
+        # Caller holds the lock; the records are already applied to the state.
+        with open(self.log_file, "ab") as f:
+            if f.tell() > self._log_offset:
+                # Under the lock, bytes past the replayed offset can only be a
+                # record torn by a crash; drop it so framing stays aligned.
+                f.truncate(self._log_offset)
+            f.write(b"".join(lines))
+            self._log_offset = f.tell()
+        self._log_sig = _file_signature(self.log_file)
+        self._log_records += len(lines)
+        if self._log_records >= self.compact_threshold and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self.compact, name=f"local-db-compact-{self.name}", daemon=True).start()
+
+    def bulk_write(self, ops: List[WriteOp]) -> Dict[str, Any]:
+        """Run ``ops`` in order with one log write for the whole batch.
+
+        Unlike MongoDB's ordered bulk writes this is all-or-nothing: if any
+        operation fails, none of the batch is persisted.
+        """
+        counts = new_write_counts()
+        with self._locked():
+            batch = _LogBatch(self._refresh(), self.codec)
+            try:
+                for index, op in enumerate(ops):
+                    apply_write(batch, index, op, counts)
+            except BaseException:
+                # Earlier operations already touched the resident state.
+                self._state = None
+                raise
+            if batch.lines:
+                self._write_lines(batch.lines)
+        return counts
+
+    def create_index(self, field: str, unique: bool = False) -> None:
+        with self._locked():
+            self._refresh().add_index(field, unique)
+            self._index_specs[field] = unique
+
+    def find_one(self, filter: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        with self._locked():
+            doc = self._refresh().find_first(filter)
+            # Callers get their own copy of the resident document.
+            return copy.deepcopy(project(doc, projection)) if doc is not None else None
+
+    def find(
+        self,
+        filter: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[SortSpec] = None,
+        skip: int = 0,
+        limit: int = 0,
+    ) -> List[Dict[str, Any]]:
+        with self._locked():
+            docs = self._refresh().find(filter)
+            if sort:
+                docs = sort_documents(docs, sort)
+            docs = docs[skip:skip + limit] if limit else docs[skip:]
+            return [copy.deepcopy(project(doc, projection)) for doc in docs]
+
+    def compact(self) -> None:
+        """Fold the current log into a new snapshot.
+
+        A ``.compacting`` log left by a compaction that died (a crash, a
+        full disk, an encode error) is folded first.
+        """
+        try:
+            with self._compaction_guard() as acquired:
+                if not acquired:
+                    return
+                try:
+                    if self._fold() and not self._fold():
+                        # Only a leftover was folded; nothing is logged since.
+                        self._log_records = 0
+                except BaseException:
+                    self._tmp_file().unlink(missing_ok=True)
+                    # Retry once another threshold's worth of records is logged.
+                    self._log_records = 0
+                    raise
+        finally:
+            self._compacting = False
+
+    def _fold(self) -> bool:
+        """Fold one log into the snapshot; True if it was a leftover ``.compacting``."""
+        with self._locked():
+            self._refresh()
+            leftover = self.compacting_file.exists()
+            if not leftover:
+                if not self.log_file.exists():
+                    return False
+                os.replace(self.log_file, self.compacting_file)
+                self._compacting_sig = _file_signature(self.compacting_file)
+                self._log_sig = None
+                self._log_offset = 0
+                self._log_records = 0
+
+        # Writers append to a fresh log while the old one is folded.
+        state = _StoreState(self._read_snapshot(), self._index_specs)
+        self._replay(state, self.compacting_file)
+        tmp_file = self._tmp_file()
+        self._write_snapshot(state.docs, tmp_file)
+
+        with self._locked():
+            self._refresh()
+            os.replace(tmp_file, self.pending_file)
+            self.compacting_file.unlink()
+            os.replace(self.pending_file, self.snapshot_file)
+            # The new snapshot holds exactly what was folded, so the
+            # resident state stays valid.
+            self._snapshot_sig = _file_signature(self.snapshot_file)
+            self._compacting_sig = None
+        return leftover
+
+    def rewrite(self) -> None:
+        """Fold the log and rewrite the snapshot in this store's codec.
+
+        Used by ``app.db.migrate`` when the source and target codecs share
+        file names (json and orjson).
+        """
+        self.compact()
+        with self._locked():
+            state = self._refresh()
+            if self.log_file.exists() or self.compacting_file.exists():
+                # Something wrote in the meantime; the next compaction re-encodes it.
+                return
+            tmp_file = self._tmp_file()
+            self._write_snapshot(state.docs, tmp_file)
+            os.replace(tmp_file, self.snapshot_file)
+            self._snapshot_sig = _file_signature(self.snapshot_file)
+
+
+_stores: Dict[Path, LocalLogStore] = {}
+_stores_lock = threading.Lock()
+_codec = None
+
+
+def _get_codec():
+    # Created on first use so an unused codec's package is never imported.
+    global _codec
+    if _codec is None:
+        _codec = get_codec(CODEC)
+    return _codec
+
+
+def _get_store(name: str, data_dir: Path, legacy_file: Optional[Path] = DB_FILE) -> LocalLogStore:
+    codec = _get_codec()
+    snapshot_file = data_dir / f"{name}{codec.snapshot_suffix}"
+    with _stores_lock:
+        store = _stores.get(snapshot_file)
+        if store is None:
+            store = LocalLogStore(snapshot_file, legacy_file=legacy_file, codec=codec)
+            _stores[snapshot_file] = store
+        return store
+
+
+class LocalJsonCollection(AsyncCollection):
+    def __init__(self, name: str, data_dir: Path, legacy_file: Optional[Path] = DB_FILE):
+        self.name = name
+        self.data_dir = data_dir
+        self._store = _get_store(name, data_dir, legacy_file)
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+
+    async def _write(self, func, *args):
+        # One writer per collection at a time; readers are not held up.
+        # Compaction lets writers keep appending, so it skips this lock.
+        async with self._store.write_lock:
+            return await self._run(func, *args)
+
+    def _bulk_write(self, ops: List[WriteOp]) -> Dict[str, Any]:
+        return self._store.bulk_write(ops)
+
+    def _find_one(self, filter: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return self._store.find_one(filter, projection)
+
+    def _find(self, filter, projection, sort, skip, limit) -> List[Dict[str, Any]]:
+        return self._store.find(filter, projection, sort, skip, limit)
+
+    def _create_index(self, field: str, unique: bool) -> None:
+        self._store.create_index(field, unique)
+
+    def _compact(self) -> None:
+        self._store.compact()
 
 
 class LocalJsonDatabase:
-    def __init__(self):
-        self.db_file = DB_FILE
+    # ``legacy_file`` seeds collections that have no files yet; None skips it.
+    def __init__(self, data_dir: Path = DATA_DIR, legacy_file: Optional[Path] = DB_FILE):
+        self.data_dir = data_dir
+        self.legacy_file = legacy_file
 
     def __getitem__(self, name: str):
-        return LocalJsonCollection(name, self.db_file)
+        return LocalJsonCollection(name, self.data_dir, self.legacy_file)
+
+
+def _backend() -> str:
+    # DB_BACKEND picks the storage: "local" (default), "sqlite" or "mongo".
+    return os.getenv("DB_BACKEND", "local").strip().lower()
+
+
+def init_database() -> None:
+    """Create the shared client up front; called from the app lifespan."""
+    if _backend() == "mongo":
+        get_client()
+
+
+def close_database() -> None:
+    if _backend() == "mongo":
+        close_client()
+
+
+async def compact_collection(collection) -> None:
+    """Reclaim space after bulk deletes; MongoDB manages this itself."""
+    if isinstance(collection, (LocalJsonCollection, SqliteCollection)):
+        await collection.compact()
 
 
 def get_database():
+    backend = _backend()
+    if backend == "mongo":
+        return get_mongo_database()
+    if backend == "sqlite":
+        return SqliteDatabase()
     return LocalJsonDatabase()
@@ -0,0 +1,348 @@
+import operator
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from pymongo import DeleteMany, DeleteOne, InsertOne, UpdateMany, UpdateOne
+
+# --- Mongo-style query helpers shared by the local and SQLite stores ---
+#
+# Filters are plain ``{field: value}`` equality maps, where a value may
+# instead be an operator document such as ``{"$in": [...]}`` or
+# ``{"$lt": cutoff}``. Projections, sort specs and bulk operations follow
+# the PyMongo shapes so callers can use the same code against MongoDB.
+
+SortSpec = List[Tuple[str, int]]
+# (kind, filter, document or update fields, upsert) with kind one of
+# insert, update_one, update_many, delete_one, delete_many.
+WriteOp = Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]
+
+
+def _coerce(value: Any, other: Any) -> Any:
+    # The JSON stores keep datetimes as str(datetime); compare them as datetimes.
+    if isinstance(other, datetime) and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _ordering(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def check(value: Any, arg: Any) -> bool:
+        value, arg = _coerce(value, arg), _coerce(arg, value)
+        if value is None or arg is None:
+            return False
+        try:
+            return compare(value, arg)
+        except TypeError:
+            return False
+
+    return check
+
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": lambda value, arg: value == arg,
+    "$ne": lambda value, arg: value != arg,
+    "$in": lambda value, arg: value in arg,
+    "$nin": lambda value, arg: value not in arg,
+    "$lt": _ordering(operator.lt),
+    "$lte": _ordering(operator.le),
+    "$gt": _ordering(operator.gt),
+    "$gte": _ordering(operator.ge),
+}
+
+
+def is_operator(condition: Any) -> bool:
+    return isinstance(condition, dict) and bool(condition) and all(
+        isinstance(key, str) and key.startswith("$") for key in condition
+    )
+
+
+def _match_value(value: Any, condition: Any) -> bool:
+    if not is_operator(condition):
+        return value == condition
+    for op, arg in condition.items():
+        check = OPERATORS.get(op)
+        if check is None:
+            raise ValueError(f"Unsupported query operator: {op}")
+        if not check(value, arg):
+            return False
+    return True
+
+
+def matches(doc: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    return all(_match_value(doc.get(k), v) for k, v in filter.items())
+
+
+def _slice(value: Any, spec: Union[int, List[int]]) -> Any:
+    # ``{"$slice": n}`` keeps the first n (last -n) items, ``[skip, n]`` a window.
+    if not isinstance(value, list):
+        return value
+    if isinstance(spec, int):
+        return value[:spec] if spec >= 0 else value[spec:]
+    skip, limit = spec
+    start = skip if skip >= 0 else max(len(value) + skip, 0)
+    return value[start : start + limit]
+
+
+def project(doc: Dict[str, Any], projection: Optional[Union[Dict[str, Any], Iterable[str]]]) -> Dict[str, Any]:
+    """Apply an inclusion or exclusion projection; ``_id`` is kept unless excluded.
+
+    Array fields may be given as ``{"$slice": ...}``; as in MongoDB, that
+    counts as an inclusion only alongside other included fields.
+    """
+    if not projection:
+        return doc
+    if not isinstance(projection, dict):
+        projection = {field: 1 for field in projection}
+    include_id = bool(projection.get("_id", 1))
+    slices = {
+        field: spec["$slice"]
+        for field, spec in projection.items()
+        if isinstance(spec, dict) and "$slice" in spec
+    }
+    fields = {field: bool(flag) for field, flag in projection.items() if field != "_id" and field not in slices}
+    if fields and any(fields.values()):
+        projected = {field: doc[field] for field, keep in fields.items() if keep and field in doc}
+        projected.update({field: _slice(doc[field], spec) for field, spec in slices.items() if field in doc})
+        if include_id and "_id" in doc:
+            projected["_id"] = doc["_id"]
+        return projected
+    excluded = {field for field, keep in fields.items() if not keep}
+    if not include_id:
+        excluded.add("_id")
+    projected = {field: value for field, value in doc.items() if field not in excluded}
+    for field, spec in slices.items():
+        if field in projected:
+            projected[field] = _slice(projected[field], spec)
+    return projected
+
+
+def normalize_sort(key_or_list: Union[str, SortSpec], direction: Optional[int] = None) -> SortSpec:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction if direction is not None else 1)]
+    return [(field, dir_) for field, dir_ in key_or_list]
+
+
+_TYPE_ORDER = {type(None): 0, bool: 4, int: 1, float: 1, str: 2, datetime: 5}
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Roughly MongoDB's cross-type order: null < numbers < strings < others.
+    rank = _TYPE_ORDER.get(type(value), 3)
+    if rank == 0:
+        return (rank, 0)
+    if rank == 3:
+        return (rank, repr(value))
+    return (rank, value)
+
+
+def sort_documents(docs: List[Dict[str, Any]], sort: SortSpec) -> List[Dict[str, Any]]:
+    ordered = list(docs)
+    # Stable sorts applied from the last key to the first give a compound order.
+    for field, direction in reversed(sort):
+        ordered.sort(key=lambda doc: _sort_key(doc.get(field)), reverse=direction < 0)
+    return ordered
+
+
+def write_ops(requests: Iterable[Any]) -> List[WriteOp]:
+    """Translate PyMongo bulk request objects into ``WriteOp`` tuples."""
+    ops: List[WriteOp] = []
+    for request in requests:
+        # PyMongo keeps the request arguments on these attributes.
+        filter = getattr(request, "_filter", None)
+        doc = getattr(request, "_doc", None)
+        upsert = bool(getattr(request, "_upsert", False))
+        if isinstance(request, InsertOne):
+            ops.append(("insert", None, doc, False))
+        elif isinstance(request, UpdateOne):
+            ops.append(("update_one", filter, doc.get("$set"), upsert))
+        elif isinstance(request, UpdateMany):
+            ops.append(("update_many", filter, doc.get("$set"), upsert))
+        elif isinstance(request, DeleteOne):
+            ops.append(("delete_one", filter, None, False))
+        elif isinstance(request, DeleteMany):
+            ops.append(("delete_many", filter, None, False))
+        else:
+            raise TypeError(f"Unsupported bulk write request: {request!r}")
+    return ops
+
+
+def write_result(counts: Dict[str, Any]):
+    """Build a result object exposing every counter PyMongo's results do."""
+    upserted_ids = counts.get("upserted_ids", {})
+    return type('BulkWriteResult', (object,), {
+        "inserted_ids": counts.get("inserted_ids", []),
+        "inserted_count": len(counts.get("inserted_ids", [])),
+        "matched_count": counts.get("matched_count", 0),
+        "modified_count": counts.get("modified_count", 0),
+        "deleted_count": counts.get("deleted_count", 0),
+        "upserted_ids": upserted_ids,
+        "upserted_count": len(upserted_ids),
+        "upserted_id": next(iter(upserted_ids.values()), None),
+    })()
+
+
+class DocumentCursor:
+    """The slice of Motor's cursor API the services use.
+
+    ``sort``, ``skip`` and ``limit`` are recorded and handed to ``fetch``,
+    which runs the whole query in one store call when the cursor is first
+    consumed.
+    """
+
+    def __init__(self, fetch: Callable[[Optional[SortSpec], int, int], Awaitable[List[Dict[str, Any]]]]):
+        self._fetch = fetch
+        self._sort: Optional[SortSpec] = None
+        self._skip = 0
+        self._limit = 0
+        self._docs: Optional[List[Dict[str, Any]]] = None
+
+    def sort(self, key_or_list: Union[str, SortSpec], direction: Optional[int] = None) -> "DocumentCursor":
+        self._sort = normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, count: int) -> "DocumentCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "DocumentCursor":
+        self._limit = count
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        if self._docs is None:
+            self._docs = await self._fetch(self._sort, self._skip, self._limit)
+        return self._docs if length is None else self._docs[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await self.to_list():
+            yield doc
+
+
+# --- Shared write planning and async surface for the local and SQLite stores ---
+
+
+def new_write_counts() -> Dict[str, Any]:
+    return {
+        "inserted_ids": [],
+        "matched_count": 0,
+        "modified_count": 0,
+        "deleted_count": 0,
+        "upserted_ids": {},
+    }
+
+
+class WriteTarget:
+    """A backend's primitive writes inside one all-or-nothing batch.
+
+    ``apply_write`` maps each ``WriteOp`` onto these, so every backend
+    matches, counts and upserts the same way. Targets are whatever
+    ``select`` returns and are only handed back to ``update``/``delete``.
+    """
+
+    def select(self, filter: Dict[str, Any], many: bool) -> List[Any]:
+        raise NotImplementedError
+
+    def insert(self, doc: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def update(self, targets: List[Any], fields: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def delete(self, targets: List[Any]) -> None:
+        raise NotImplementedError
+
+
+def apply_write(target: WriteTarget, index: int, op: WriteOp, counts: Dict[str, Any]) -> None:
+    kind, filter, doc, upsert = op
+    if kind == "insert":
+        target.insert(doc)
+        counts["inserted_ids"].append(doc.get("_id"))
+        return
+
+    found = target.select(filter, many=kind in ("update_many", "delete_many"))
+    if kind in ("delete_one", "delete_many"):
+        if found:
+            target.delete(found)
+        counts["deleted_count"] += len(found)
+        return
+
+    if found:
+        counts["matched_count"] += len(found)
+        counts["modified_count"] += len(found)
+        if doc:
+            target.update(found, doc)
+        return
+
+    if upsert:
+        new_doc = {k: v for k, v in filter.items() if not is_operator(v)}
+        new_doc.update(doc or {})
+        target.insert(new_doc)
+        counts["upserted_ids"][index] = new_doc.get("_id")
+
+
+class AsyncCollection:
+    """The Motor collection methods the services use, over a blocking backend.
+
+    Subclasses implement ``_run`` (run a blocking call off the event loop)
+    and the blocking ``_bulk_write``, ``_find_one``, ``_find``,
+    ``_create_index`` and ``_compact``. ``_bulk_write`` is all-or-nothing,
+    so ``ordered`` only matters for MongoDB. ``_write`` wraps calls that
+    change data; override it to serialize writers.
+    """
+
+    async def _run(self, func, *args):
+        raise NotImplementedError
+
+    async def _write(self, func, *args):
+        return await self._run(func, *args)
+
+    async def create_index(self, field: str, unique: bool = False) -> str:
+        await self._write(self._create_index, field, unique)
+        return f"{field}_1"
+
+    async def find_one(
+        self, filter: Dict[str, Any], projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        return await self._run(self._find_one, filter, projection)
+
+    def find(
+        self, filter: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None
+    ) -> DocumentCursor:
+        return DocumentCursor(
+            lambda sort, skip, limit: self._run(self._find, filter or {}, projection, sort, skip, limit)
+        )
+
+    async def insert_one(self, document: Dict[str, Any]):
+        # Raises ValueError when a unique index (always including _id) clashes
+        await self._write(self._bulk_write, [("insert", None, document, False)])
+        return type('InsertOneResult', (object,), {"inserted_id": document.get("_id")})()
+
+    async def insert_many(self, documents: List[Dict[str, Any]]):
+        counts = await self._write(
+            self._bulk_write, [("insert", None, document, False) for document in documents]
+        )
+        return type('InsertManyResult', (object,), {"inserted_ids": counts["inserted_ids"]})()
+
+    async def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        counts = await self._write(self._bulk_write, [("update_one", filter, update.get("$set"), upsert)])
+        return write_result(counts)
+
+    async def update_many(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        counts = await self._write(self._bulk_write, [("update_many", filter, update.get("$set"), upsert)])
+        return write_result(counts)
+
+    async def delete_many(self, filter: Dict[str, Any]):
+        counts = await self._write(self._bulk_write, [("delete_many", filter, None, False)])
+        return write_result(counts)
+
+    async def bulk_write(self, requests: List[Any], ordered: bool = True):
+        counts = await self._write(self._bulk_write, write_ops(requests))
+        return write_result(counts)
+
+    async def compact(self) -> None:
+        await self._run(self._compact)
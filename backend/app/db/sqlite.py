@@ -0,0 +1,344 @@
+import os
+import re
+import json
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.db.query import (
+    AsyncCollection,
+    SortSpec,
+    WriteOp,
+    WriteTarget,
+    apply_write,
+    is_operator,
+    matches,
+    new_write_counts,
+    project,
+    sort_documents,
+)
+
+# --- SQLite Storage Implementation ---
+#
+# Each collection is a table of JSON documents: an integer rowid, the ``_id``
+# lifted into its own UNIQUE column, and the document text. Secondary indexes
+# are expression indexes on ``json_extract(doc, '$.field')`` so equality,
+# ``$in`` and range filters on indexed fields are answered by SQLite instead
+# of a scan.
+#
+# The database runs in WAL mode, so any number of uvicorn workers can read
+# while one writes. Writes use BEGIN IMMEDIATE so a read-modify-write on a
+# document is serialized across processes.
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+SQLITE_PATH = Path(os.getenv("SQLITE_PATH", str(BACKEND_DIR / "local_data.sqlite3")))
+LEGACY_DB_FILE = BACKEND_DIR / "local_data.json"
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SQLITE_IO_THREADS", "4")),
+    thread_name_prefix="sqlite-db",
+)
+_local = threading.local()
+_tables: set = set()
+_tables_lock = threading.Lock()
+
+_SCALARS = (str, int, float, bool, type(None))
+_COMPARISONS = {"$lt": "<", "$lte": "<=", "$gt": ">", "$gte": ">="}
+# Stored datetimes are str(datetime) or ISO text with any offset, so text
+# comparison is only trusted to the day; widened by this much, it narrows
+# the rows and Python makes the exact comparison.
+_DATETIME_SLACK = timedelta(days=2)
+# Field names are spliced into JSON paths, so only plain identifiers qualify.
+_FIELD_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    # sqlite3 connections are not shared between threads, so each pool thread
+    # keeps its own.
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, isolation_level=None, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[path] = conn
+    return conn
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _legacy_documents(name: str) -> List[Dict[str, Any]]:
+    if not LEGACY_DB_FILE.exists():
+        return []
+    try:
+        with open(LEGACY_DB_FILE, "r") as f:
+            legacy = json.load(f)
+    except json.JSONDecodeError:
+        return []
+    docs = legacy.get(name) if isinstance(legacy, dict) else None
+    return docs or []
+
+
+def _quote_path(field: str) -> str:
+    return f"'$.{field}'"
+
+
+def _condition(column: str, kind: str, op: str, arg: Any) -> Tuple[Optional[str], List[Any], bool]:
+    """Translate one operator to SQL.
+
+    Returns the clause (``None`` if SQL can't express it), its parameters,
+    and whether the clause is exact; an inexact clause only narrows the rows
+    and the operator is still checked in Python.
+    """
+    if op == "$eq" and isinstance(arg, _SCALARS):
+        return (f"{column} IS NULL", [], True) if arg is None else (f"{column} = ?", [arg], True)
+    if op == "$ne" and isinstance(arg, _SCALARS):
+        # As in Python, a missing field is not equal to anything but null.
+        if arg is None:
+            return f"{column} IS NOT NULL", [], True
+        return f"({column} IS NULL OR {column} != ?)", [arg], True
+    if op == "$in" and isinstance(arg, (list, tuple, set)) and all(isinstance(item, _SCALARS) for item in arg):
+        values = [item for item in arg if item is not None]
+        clauses = [f"{column} IN ({', '.join('?' * len(values))})"] if values else []
+        if len(values) < len(arg):
+            clauses.append(f"{column} IS NULL")
+        return f"({' OR '.join(clauses) or '0'})", values, True
+    if op in _COMPARISONS and isinstance(arg, datetime):
+        # Dates lead every stored form, so whole days bound the exact answer.
+        if op in ("$lt", "$lte"):
+            return f"{column} < ?", [(arg + _DATETIME_SLACK).date().isoformat()], False
+        return f"{column} >= ?", [(arg - _DATETIME_SLACK).date().isoformat()], False
+    if op in _COMPARISONS and isinstance(arg, (int, float, str)) and arg is not True and arg is not False:
+        # SQLite orders across types; Python only compares numbers with numbers
+        # (bools included) and text with text.
+        types = "('text')" if isinstance(arg, str) else "('integer', 'real', 'true', 'false')"
+        return f"({kind} IN {types} AND {column} {_COMPARISONS[op]} ?)", [arg], True
+    return None, [], False
+
+
+def _where(filter: Dict[str, Any]) -> Tuple[str, List[Any], Dict[str, Any]]:
+    """Translate equality, ``$eq``/``$ne``/``$in`` and range filters to SQL.
+
+    Returns the WHERE clause, its parameters, and the part of the filter that
+    SQL cannot express exactly (nested values, other operators, datetime
+    ranges), which is checked in Python.
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+    residual: Dict[str, Any] = {}
+    for field, value in filter.items():
+        if not _FIELD_RE.match(field):
+            residual[field] = value
+            continue
+        if field == "_id":
+            column, kind = "_id", "typeof(_id)"
+        else:
+            column = f"json_extract(doc, {_quote_path(field)})"
+            kind = f"json_type(doc, {_quote_path(field)})"
+        if not is_operator(value):
+            if not isinstance(value, _SCALARS):
+                residual[field] = value
+                continue
+            value = {"$eq": value}
+        remaining: Dict[str, Any] = {}
+        for op, arg in value.items():
+            clause, clause_params, exact = _condition(column, kind, op, arg)
+            if clause is not None:
+                clauses.append(clause)
+                params.extend(clause_params)
+            if not exact:
+                remaining[op] = arg
+        if remaining:
+            residual[field] = remaining
+    return (" AND ".join(clauses) or "1"), params, residual
+
+
+class _SqliteBatch(WriteTarget):
+    """Writes of one ``_bulk_write`` transaction; targets are ``(rowid, doc)``."""
+
+    def __init__(self, collection: "SqliteCollection", conn: sqlite3.Connection):
+        self.collection = collection
+        self.conn = conn
+
+    def select(self, filter: Dict[str, Any], many: bool) -> List[Tuple[int, Dict[str, Any]]]:
+        if many:
+            return self.collection._select_all(self.conn, filter)
+        found = self.collection._select(self.conn, filter)
+        return [found] if found is not None else []
+
+    def insert(self, doc: Dict[str, Any]) -> None:
+        self.collection._insert(self.conn, doc)
+
+    def update(self, targets: List[Tuple[int, Dict[str, Any]]], fields: Dict[str, Any]) -> None:
+        for row_id, target in targets:
+            target.update(fields)
+            self.collection._update(self.conn, row_id, target)
+
+    def delete(self, targets: List[Tuple[int, Dict[str, Any]]]) -> None:
+        self.conn.executemany(
+            f"DELETE FROM {self.collection._table} WHERE id = ?", [(row_id,) for row_id, _ in targets]
+        )
+
+
+class SqliteCollection(AsyncCollection):
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = path
+        self._table = _quote(name)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = _connect(self.path)
+        key = (self.path, self.name)
+        if key not in _tables:
+            with _tables_lock:
+                if key not in _tables:
+                    self._create_table(conn)
+                    _tables.add(key)
+        return conn
+
+    def _create_table(self, conn: sqlite3.Connection) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.name,)
+            ).fetchone()
+            if not exists:
+                conn.execute(
+                    f"CREATE TABLE {self._table} "
+                    "(id INTEGER PRIMARY KEY, _id UNIQUE, doc TEXT NOT NULL)"
+                )
+                # A fresh table starts from whatever the JSON store held.
+                for document in _legacy_documents(self.name):
+                    self._insert(conn, document)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+
+    def _select(
+        self, conn: sqlite3.Connection, filter: Dict[str, Any]
+    ) -> Optional[Tuple[int, Dict[str, Any]]]:
+        where, params, residual = _where(filter)
+        sql = f"SELECT id, doc FROM {self._table} WHERE {where} ORDER BY id"
+        if not residual:
+            sql += " LIMIT 1"
+        for row_id, raw in conn.execute(sql, params):
+            doc = json.loads(raw)
+            if matches(doc, residual):
+                return row_id, doc
+        return None
+
+    def _insert(self, conn: sqlite3.Connection, document: Dict[str, Any]) -> None:
+        try:
+            conn.execute(
+                f"INSERT INTO {self._table} (_id, doc) VALUES (?, ?)",
+                (document.get("_id"), json.dumps(document, default=str)),
+            )
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(f"Duplicate key error: {document.get('_id')} ({exc})") from exc
+
+    def _create_index(self, field: str, unique: bool) -> None:
+        if field == "_id":
+            return
+        if not _FIELD_RE.match(field):
+            raise ValueError(f"Unsupported index field: {field}")
+        index_name = _quote(f"ix_{self.name}_{field}")
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        try:
+            self._conn().execute(
+                f"CREATE {kind} IF NOT EXISTS {index_name} "
+                f"ON {self._table} (json_extract(doc, {_quote_path(field)}))"
+            )
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(f"Duplicate key error: cannot create unique index on {field}") from exc
+
+    def _select_all(
+        self, conn: sqlite3.Connection, filter: Dict[str, Any]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        where, params, residual = _where(filter)
+        sql = f"SELECT id, doc FROM {self._table} WHERE {where} ORDER BY id"
+        rows = ((row_id, json.loads(raw)) for row_id, raw in conn.execute(sql, params))
+        return [(row_id, doc) for row_id, doc in rows if matches(doc, residual)]
+
+    def _find(
+        self,
+        filter: Dict[str, Any],
+        projection: Optional[Dict[str, Any]],
+        sort: Optional[SortSpec],
+        skip: int,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        where, params, residual = _where(filter)
+        sort = sort or []
+        if not residual and all(_FIELD_RE.match(field) for field, _ in sort):
+            # Everything fits in SQL, so ordering and paging happen there too.
+            order = [
+                f"{'_id' if field == '_id' else f'json_extract(doc, {_quote_path(field)})'} "
+                f"{'DESC' if direction < 0 else 'ASC'}"
+                for field, direction in sort
+            ]
+            sql = (
+                f"SELECT doc FROM {self._table} WHERE {where} "
+                f"ORDER BY {', '.join(order + ['id'])} LIMIT ? OFFSET ?"
+            )
+            rows = self._conn().execute(sql, [*params, limit or -1, skip])
+            return [project(json.loads(raw), projection) for (raw,) in rows]
+        docs = [doc for _, doc in self._select_all(self._conn(), filter)]
+        if sort:
+            docs = sort_documents(docs, sort)
+        docs = docs[skip:skip + limit] if limit else docs[skip:]
+        return [project(doc, projection) for doc in docs]
+
+    def _update(self, conn: sqlite3.Connection, row_id: int, doc: Dict[str, Any]) -> None:
+        try:
+            conn.execute(
+                f"UPDATE {self._table} SET _id = ?, doc = ? WHERE id = ?",
+                (doc.get("_id"), json.dumps(doc, default=str), row_id),
+            )
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(f"Duplicate key error: {exc}") from exc
+
+    def _bulk_write(self, ops: List[WriteOp]) -> Dict[str, Any]:
+        """Run ``ops`` in one transaction; any failure rolls back the batch."""
+        counts = new_write_counts()
+        conn = self._conn()
+        batch = _SqliteBatch(self, conn)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for index, op in enumerate(ops):
+                apply_write(batch, index, op, counts)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return counts
+
+    def _compact(self) -> None:
+        # Freed pages are reused by later inserts; truncating the WAL keeps
+        # the -wal file from holding on to the deleted rows.
+        self._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _find_one(self, filter: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        found = self._select(self._conn(), filter)
+        return project(found[1], projection) if found else None
+
+
+class SqliteDatabase:
+    def __init__(self, path: Path = SQLITE_PATH):
+        self.path = path
+
+    def __getitem__(self, name: str):
+        return SqliteCollection(name, self.path)
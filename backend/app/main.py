@@ -1,4 +1,6 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 try:
@@ -15,7 +17,19 @@ if load_dotenv is not None:
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.db.mongodb import close_database, init_database
 from app.routers import generate, research, topics, voice
+from app.routers.topics import TOPIC_ID_MAPPING
+from app.services.parallel_ai import close_poller
+from app.services.refresher import run_topic_refresher
+from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.research import (
+    backfill_research,
+    ensure_indexes,
+    flush_task_writes,
+    run_task_flusher,
+    run_task_sweeper,
+)
 
 
 def _get_cors_origins() -> list[str]:
@@ -37,7 +51,30 @@ def _get_cors_origins() -> list[str]:
     return origins
 
 
-app = FastAPI(title="GENzNEWS API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_database()
+    await ensure_indexes()
+    await backfill_research()
+    await start_scheduler()
+    background = [
+        asyncio.create_task(run_task_sweeper()),
+        asyncio.create_task(run_task_flusher()),
+        asyncio.create_task(run_topic_refresher(TOPIC_ID_MAPPING.values())),
+    ]
+    yield
+    for task in background:
+        task.cancel()
+    for task in background:
+        with suppress(asyncio.CancelledError):
+            await task
+    await stop_scheduler()
+    await close_poller()
+    await flush_task_writes()
+    close_database()
+
+
+app = FastAPI(title="GENzNEWS API", lifespan=lifespan)
 
 origins = _get_cors_origins()
 if origins:
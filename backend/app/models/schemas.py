@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
@@ -32,6 +32,8 @@ class TopicDetailResponse(BaseModel):
     last_refreshed_at: Optional[datetime] = None
     research_summary: Optional[str] = None
     sources: List[Source]
+    # True while the research is a fast preview awaiting the full run.
+    preview: bool = False
 
 
 class ScriptSegment(BaseModel):
@@ -109,6 +111,8 @@ class VideoScriptResponse(BaseModel):
 class ResearchRefreshRequest(BaseModel):
     topic_id: str
     query: Optional[str] = None
+    # Start a new run even if one is already queued or running for the topic.
+    force: bool = False
 
 
 class ResearchRefreshResponse(BaseModel):
@@ -124,6 +128,38 @@ class ResearchResult(BaseModel):
 class ResearchTaskResponse(BaseModel):
     task_id: str
     status: str
+    # True when the refresh joined a task already in flight for the topic.
+    attached: bool = False
+    # True when the task was completed from a recent identical query.
+    cache_hit: bool = False
+
+
+class ResearchBatchRequest(BaseModel):
+    # Bare topic ids, or {topic_id, query} items for custom queries.
+    topics: List[Union[str, ResearchRefreshRequest]]
+    force: bool = False
+
+
+class ResearchBatchTask(BaseModel):
+    topic_id: str
+    task_id: str
+    status: str
+    attached: bool = False
+    cache_hit: bool = False
+    error: Optional[str] = None
+
+
+class ResearchBatchResponse(BaseModel):
+    batch_id: str
+    tasks: List[ResearchBatchTask]
+
+
+class ResearchBatchStatusResponse(BaseModel):
+    batch_id: str
+    total: int
+    counts: Dict[str, int]
+    done: bool
+    tasks: List[ResearchBatchTask]
 
 
 class ResearchTaskStatusResponse(BaseModel):
@@ -131,6 +167,7 @@ class ResearchTaskStatusResponse(BaseModel):
     status: str
     result: Optional[ResearchResult] = None
     error: Optional[str] = None
+    cache_hit: bool = False
 
 
 class ResearchResultResponse(BaseModel):
@@ -138,3 +175,4 @@ class ResearchResultResponse(BaseModel):
     summary: Optional[str] = None
     sources: List[Source] = []
     generated_at: Optional[datetime] = None
+    preview: bool = False
@@ -13,7 +13,7 @@ from app.models.schemas import (
     ScriptResponse,
     VideoScriptResponse,
 )
-from app.services.research import get_research_result, normalize_research_summary
+from app.services.research import get_research_result
 from app.services.llm import (
     generate_script_content,
     generate_article_content,
@@ -49,7 +49,7 @@ async def generate_script(payload: GenerateScriptRequest) -> ScriptResponse:
     research = await get_research_result(db_topic_id)
     summary = ""
     if research:
-        summary = normalize_research_summary(research.get("summary", ""))
+        summary = research.get("summary", "")
         # Optionally append source titles for context
         sources = research.get("sources", [])
         if sources:
@@ -82,7 +82,7 @@ async def generate_article(payload: GenerateArticleRequest) -> ArticleResponse:
     research = await get_research_result(db_topic_id)
     summary = ""
     if research:
-        summary = normalize_research_summary(research.get("summary", ""))
+        summary = research.get("summary", "")
     
     title, intro, sections = await generate_article_content(
         topic=payload.topic_id,
@@ -104,7 +104,7 @@ async def generate_podcast(payload: GeneratePodcastRequest) -> PodcastResponse:
     research = await get_research_result(db_topic_id)
     summary = ""
     if research:
-        summary = normalize_research_summary(research.get("summary", ""))
+        summary = research.get("summary", "")
 
     segments = await generate_podcast_script(
         topic=payload.topic_id,
@@ -0,0 +1,67 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+
+# ``?fields=`` projection and ``?sources_limit=&sources_cursor=`` paging for
+# responses built from a research document. The requested fields are mapped
+# to the stored fields they come from, so the storage read returns only
+# those and a window of ``sources`` rather than the whole document.
+
+SOURCES_PAGE_MAX = 100
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """Split a comma-separated ``fields`` parameter; ``None`` means every field."""
+    if fields is None:
+        return None
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "fields must name at least one field",
+        )
+    return requested
+
+
+def parse_cursor(cursor: Optional[str]) -> int:
+    # Cursors are the offset of the next source; opaque to clients.
+    if cursor is None:
+        return 0
+    if not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid sources_cursor")
+    return int(cursor)
+
+
+def storage_projection(
+    requested: List[str],
+    stored_fields: Dict[str, Optional[str]],
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Map response fields to a storage projection.
+
+    ``stored_fields`` gives the document field each response field is read
+    from, or ``None`` for fields that don't come from storage. With a page
+    requested, ``sources`` is sliced in the read and ``source_count`` is
+    included for the total.
+    """
+    projection: Dict[str, Any] = {"topic_id": 1}
+    for field in requested:
+        stored = stored_fields.get(field)
+        if stored is not None:
+            projection[stored] = 1
+    if "sources" in requested and limit is not None:
+        projection["sources"] = {"$slice": [offset, limit]}
+        projection["source_count"] = 1
+    return projection
+
+
+def page_fields(doc: Dict[str, Any], offset: int) -> Dict[str, Any]:
+    """``sources_total`` and ``next_sources_cursor`` for a sliced read."""
+    total = doc.get("source_count", 0)
+    end = offset + len(doc.get("sources") or [])
+    return {
+        "sources_total": total,
+        "next_sources_cursor": str(end) if end < total else None,
+    }
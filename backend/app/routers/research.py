@@ -1,33 +1,124 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic_core import to_jsonable_python
 
 from app.models.schemas import (
+    ResearchBatchRequest,
+    ResearchBatchResponse,
+    ResearchBatchStatusResponse,
+    ResearchBatchTask,
     ResearchRefreshRequest,
     ResearchTaskResponse,
     ResearchTaskStatusResponse,
     ResearchResultResponse,
 )
+from app.routers.conditional import cache_headers, conditional_response, make_etag
+from app.routers.projection import SOURCES_PAGE_MAX, page_fields, parse_cursor, parse_fields, storage_projection
+from app.services.polling import polling_stats
 from app.services.research import (
-    create_research_task,
+    ACTIVE_STATUSES,
+    PRIORITY_USER,
+    RESEARCH_VERSION_PROJECTION,
+    TERMINAL_STATUSES,
+    WORKER_ID,
+    as_datetime,
+    get_research_batch,
     get_research_task,
     get_research_result,
-    run_research_task,
+    start_research_batch,
+    start_research_task,
 )
+from app.services.scheduler import get_scheduler
+from app.services.task_events import Subscription, subscribe
 
 router = APIRouter()
 
+# Idle streams send a comment this often so proxies keep the connection open.
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("RESEARCH_STREAM_KEEPALIVE_SECONDS", "15"))
+
 
 @router.post("/research/refresh", response_model=ResearchTaskResponse)
-async def refresh_research(
-    payload: ResearchRefreshRequest,
-    background_tasks: BackgroundTasks,
-) -> ResearchTaskResponse:
+async def refresh_research(payload: ResearchRefreshRequest) -> ResearchTaskResponse:
     query = payload.query or payload.topic_id
     try:
-        task_id = await create_research_task(payload.topic_id, query)
+        task, created = await start_research_task(payload.topic_id, query, force=payload.force)
     except RuntimeError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
-    background_tasks.add_task(run_research_task, task_id)
-    return ResearchTaskResponse(task_id=task_id, status="queued")
+    task_id = task["_id"]
+    cache_hit = bool(task.get("cache_hit"))
+    if created and not cache_hit:
+        get_scheduler().submit(task_id, PRIORITY_USER)
+    return ResearchTaskResponse(
+        task_id=task_id,
+        status=task.get("status", "queued"),
+        attached=not created,
+        cache_hit=cache_hit,
+    )
+
+
+@router.post("/research/refresh-batch", response_model=ResearchBatchResponse)
+async def refresh_research_batch(payload: ResearchBatchRequest) -> ResearchBatchResponse:
+    items = []
+    for topic in payload.topics:
+        if isinstance(topic, str):
+            items.append((topic, topic, payload.force))
+        else:
+            items.append((topic.topic_id, topic.query or topic.topic_id, payload.force or topic.force))
+    if not items:
+        raise HTTPException(status_code=422, detail="At least one topic is required")
+    try:
+        batch_id, started = await start_research_batch(items, priority=PRIORITY_USER)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    # Runs share the worker pool, so RESEARCH_WORKERS bounds the fan-out.
+    scheduler = get_scheduler()
+    tasks = []
+    for task, created in started:
+        cache_hit = bool(task.get("cache_hit"))
+        if created and not cache_hit:
+            scheduler.submit(task["_id"], PRIORITY_USER)
+        tasks.append(
+            ResearchBatchTask(
+                topic_id=task["topic_id"],
+                task_id=task["_id"],
+                status=task.get("status", "queued"),
+                attached=not created,
+                cache_hit=cache_hit,
+                error=task.get("error"),
+            )
+        )
+    return ResearchBatchResponse(batch_id=batch_id, tasks=tasks)
+
+
+@router.get("/research/batch/{batch_id}", response_model=ResearchBatchStatusResponse)
+async def get_research_batch_status(batch_id: str) -> ResearchBatchStatusResponse:
+    batch = await get_research_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    tasks = []
+    counts: Dict[str, int] = {}
+    for entry in batch["tasks"]:
+        # A task removed by the retention sweep reports as "expired".
+        task = entry["task"] or {}
+        status = task.get("status", "expired")
+        counts[status] = counts.get(status, 0) + 1
+        tasks.append(
+            ResearchBatchTask(
+                topic_id=entry["topic_id"],
+                task_id=entry["task_id"],
+                status=status,
+                cache_hit=bool(task.get("cache_hit")),
+                error=task.get("error"),
+            )
+        )
+    done = all(task.status not in ACTIVE_STATUSES for task in tasks)
+    return ResearchBatchStatusResponse(batch_id=batch_id, total=len(tasks), counts=counts, done=done, tasks=tasks)
 
 
 @router.get("/research/status/{task_id}", response_model=ResearchTaskStatusResponse)
@@ -40,17 +131,161 @@ async def get_research_status(task_id: str) -> ResearchTaskStatusResponse:
         status=task.get("status", "unknown"),
         result=task.get("result"),
         error=task.get("error"),
+        cache_hit=bool(task.get("cache_hit")),
     )
 
 
+def _visible_state(task: Dict[str, Any]) -> tuple:
+    return task.get("status"), task.get("upstream_status"), task.get("preview_ready"), task.get("error")
+
+
+def _status_event(task_id: str, task: Dict[str, Any]) -> str:
+    status = task.get("status", "unknown")
+    payload = {
+        "task_id": task_id,
+        "status": status,
+        "upstream_status": task.get("upstream_status"),
+        # Set once a preview has been saved and GET /research/{topic_id} serves it.
+        "preview_ready": bool(task.get("preview_ready")),
+        "error": task.get("error"),
+        # The full result only goes out once, with the terminal event.
+        "result": task.get("result") if status in TERMINAL_STATUSES else None,
+    }
+    return f"event: status\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def _stream_status(task_id: str, subscription: Subscription, task: Dict[str, Any]) -> AsyncIterator[str]:
+    # Tasks run by another worker publish nowhere we can hear, so those
+    # streams re-read the task on each keepalive instead.
+    remote = task.get("owner") != WORKER_ID and task.get("storage") != "memory"
+    # Closed here rather than in a background task: on a disconnect the
+    # response raises before any background task would run.
+    try:
+        yield _status_event(task_id, task)
+        while task.get("status") not in TERMINAL_STATUSES:
+            try:
+                update = await asyncio.wait_for(subscription.queue.get(), STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                latest = await get_research_task(task_id) if remote else None
+                if latest is None or latest.get("status") == task.get("status"):
+                    yield ": keepalive\n\n"
+                    continue
+                update = latest
+            seen = _visible_state(task)
+            task = {**task, **update}
+            if _visible_state(task) != seen:
+                yield _status_event(task_id, task)
+    finally:
+        subscription.close()
+
+
+class _EventStreamResponse(StreamingResponse):
+    """Closes its generator however streaming ends, so cleanup in it runs at once."""
+
+    async def stream_response(self, send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            await self.body_iterator.aclose()
+
+
+@router.get("/research/status/{task_id}/stream")
+async def stream_research_status(task_id: str) -> StreamingResponse:
+    """Server-Sent Events feed of a task's status until it completes or fails."""
+    # Subscribed before the read so no update can fall between the two.
+    subscription = subscribe(task_id)
+    task = await get_research_task(task_id)
+    if not task:
+        subscription.close()
+        raise HTTPException(status_code=404, detail="Task not found")
+    return _EventStreamResponse(
+        _stream_status(task_id, subscription, task),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/research/polling-stats")
+async def get_polling_stats(processor: Optional[str] = None) -> Dict[str, Any]:
+    """Polls-per-task and completion-time histograms per Parallel.ai processor."""
+    return polling_stats(processor)
+
+
+@router.get("/research/queue-stats")
+async def get_queue_stats() -> Dict[str, Any]:
+    """Research scheduler queue depth, wait times and worker usage."""
+    return get_scheduler().stats()
+
+
+# Where each ResearchResultResponse field is stored on the research document.
+RESEARCH_STORED_FIELDS = {
+    "topic_id": "topic_id",
+    "summary": "summary",
+    "sources": "sources",
+    "generated_at": "generated_at",
+    "preview": "preview",
+}
+
+
 @router.get("/research/{topic_id}", response_model=ResearchResultResponse)
-async def get_research(topic_id: str) -> ResearchResultResponse:
-    doc = await get_research_result(topic_id)
-    if not doc:
+async def get_research(
+    topic_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    sources_limit: Optional[int] = Query(None, ge=1, le=SOURCES_PAGE_MAX),
+    sources_cursor: Optional[str] = None,
+) -> ResearchResultResponse:
+    """Stored research for a topic.
+
+    ``fields`` is a comma-separated subset of the response fields. With
+    ``sources_limit`` or ``sources_cursor`` the sources come back one page
+    at a time, with ``sources_total`` and ``next_sources_cursor`` added.
+    """
+    requested = parse_fields(fields, ResearchResultResponse.model_fields)
+    offset = parse_cursor(sources_cursor)
+    paged = sources_limit is not None or sources_cursor is not None
+    limit = (sources_limit or SOURCES_PAGE_MAX) if paged else None
+
+    version = await get_research_result(topic_id, RESEARCH_VERSION_PROJECTION)
+    if not version:
         raise HTTPException(status_code=404, detail="Research not found")
-    return ResearchResultResponse(
-        topic_id=topic_id,
-        summary=doc.get("summary"),
-        sources=doc.get("sources", []),
-        generated_at=doc.get("generated_at"),
+    generated_at = as_datetime(version.get("generated_at"))
+    etag = make_etag(
+        "research", topic_id, generated_at, version.get("preview"), version.get("format_version"), requested, offset, limit
     )
+    not_modified = conditional_response(request, response, etag, generated_at)
+    if not_modified is not None:
+        return not_modified
+
+    if requested is None and not paged:
+        doc = await get_research_result(topic_id)
+        if not doc:
+            raise HTTPException(status_code=404, detail="Research not found")
+        return ResearchResultResponse(
+            topic_id=topic_id,
+            summary=doc.get("summary"),
+            sources=doc.get("sources", []),
+            generated_at=doc.get("generated_at"),
+            preview=bool(doc.get("preview")),
+        )
+
+    # Partial responses skip the response model; only the projected fields are read.
+    requested = requested or list(RESEARCH_STORED_FIELDS)
+    doc = await get_research_result(topic_id, storage_projection(requested, RESEARCH_STORED_FIELDS, offset, limit))
+    if not doc:
+        raise HTTPException(status_code=404, detail="Research not found")
+    body: Dict[str, Any] = {
+        field: doc.get(stored) for field, stored in RESEARCH_STORED_FIELDS.items() if field in requested
+    }
+    if "topic_id" in body:
+        body["topic_id"] = topic_id
+    if "sources" in body:
+        body["sources"] = body["sources"] or []
+        if paged:
+            body.update(page_fields(doc, offset))
+    if "generated_at" in body:
+        body["generated_at"] = as_datetime(body["generated_at"])
+    if "preview" in body:
+        body["preview"] = bool(body["preview"])
+    return JSONResponse(to_jsonable_python(body), headers=cache_headers(etag, generated_at))
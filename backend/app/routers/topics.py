@@ -1,173 +1,79 @@
-import re
-from fastapi import APIRouter
-from app.models.schemas import Topic, TopicDetailResponse, TopicsResponse, Source
-from app.services.research import get_research_result
-from app.services.llm import clean_markdown
+import os
+from typing import Optional
 
-router = APIRouter()
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_jsonable_python
 
-TOPIC_ID_MAPPING = {
-    "politics": "tell me the latest news pertaining to american politics",
-    "sports": "tell me the latest news pertaining to american sports",
-    "climate": "tell me the latest news pertaining to climate change",
-    "tech": "tell me the latest news pertaining to tech and ai",
-    "economy": "tell me the latest news pertaining to global economy",
-    "health": "tell me the latest news pertaining to health and science",
-}
+from app.models.schemas import TopicDetailResponse, TopicsResponse, Source
+from app.routers.conditional import cache_headers, conditional_response, make_etag
+from app.routers.projection import SOURCES_PAGE_MAX, page_fields, parse_cursor, parse_fields, storage_projection
+from app.services.lru import LRUCache
+from app.services.research import (
+    RESEARCH_VERSION_PROJECTION,
+    as_datetime,
+    get_research_result,
+    get_research_results,
+)
+from app.services.topic_view import TOPIC_CONFIGS, TOPIC_ID_MAPPING, get_topic_view
 
-def parse_task_output(text: str) -> tuple[str, list[Source]]:
-    """
-    Attempt to parse the string representation of TaskRunTextOutput.
-    Extracts 'content' for summary and 'citations' for sources.
-    """
-    summary = text
-    sources = []
-    
-    # 1. Extract content='...'
-    # Use triple quotes for regex to avoid escaping issues
-    # Match content='...' followed by either a comma and another kwarg, or the closing paren
-    content_match = re.search(r"""content=(['"])(.*?)\1(?:,\s*[a-zA-Z_]\w*=|\)$)""", text, re.DOTALL)
-    if content_match:
-        raw_content = content_match.group(2)
-        # Use raw content directly - unicode_escape corrupts UTF-8 multi-byte chars
-        summary = raw_content
-    
-    # 2. Extract citations - try multiple patterns to handle different orderings
-    # Find all Citation(...) blocks first
-    citation_blocks = re.findall(r"Citation\([^)]+\)", text)
-    
-    for block in citation_blocks:
-        # Extract url and title from each Citation block (flexible field ordering)
-        url_match = re.search(r"url=['\"]([^'\"]+)['\"]", block)
-        title_match = re.search(r"title=['\"]([^'\"]+)['\"]", block)
-        
-        if url_match:
-            sources.append(Source(
-                title=title_match.group(1) if title_match else "Source",
-                url=url_match.group(1),
-                source_name="", 
-                snippet="",
-                published_at=None
-            ))
-    
-    # Fallback: try the original strict pattern if no sources found
-    if not sources:
-        citation_pattern = re.compile(r"Citation\(url='(.*?)', excerpts=\[.*?\], title='(.*?)'\)")
-        matches = citation_pattern.findall(text)
-        for url, title in matches:
-            sources.append(Source(
-                title=title,
-                url=url,
-                source_name="", 
-                snippet="",
-                published_at=None
-            ))
-        
-    return summary, sources
-
-async def get_real_article_count(topic_id: str) -> int:
-    mapped_id = TOPIC_ID_MAPPING.get(topic_id, topic_id)
-    research = await get_research_result(mapped_id)
-    
-    if not research:
-        return 0
-        
-    # Check for explicit sources first
-    db_sources = research.get("sources", [])
-    if db_sources:
-        return len(db_sources)
-        
-    # Fallback to parsing summary
-    raw_summary = research.get("summary", "")
-    if "TaskRunTextOutput" in raw_summary:
-        _, parsed_sources = parse_task_output(raw_summary)
-        return len(parsed_sources)
-        
-    return 0
+router = APIRouter()
+
+# Rendered /topics/{id} bodies, keyed by the research version they show.
+TOPIC_DETAIL_CACHE_SIZE = int(os.getenv("TOPIC_DETAIL_CACHE_SIZE", "64"))
+_detail_cache = LRUCache(TOPIC_DETAIL_CACHE_SIZE)
 
 @router.get("/topics", response_model=TopicsResponse)
-async def list_topics() -> TopicsResponse:
-    from datetime import datetime, timezone
-    now = datetime.now(timezone.utc)
-    
-    topic_configs = [
-        {"id": "politics", "label": "US Politics", "emoji": "🇺🇸"},
-        {"id": "sports", "label": "Sports", "emoji": "⚽"},
-        {"id": "climate", "label": "Climate Change", "emoji": "🌍"},
-        {"id": "tech", "label": "Tech & AI", "emoji": "🤖"},
-        {"id": "economy", "label": "Global Economy", "emoji": "📈"},
-        {"id": "health", "label": "Health & Science", "emoji": "🧬"},
-    ]
-    
-    topics = []
-    for config in topic_configs:
-        count = await get_real_article_count(config["id"])
-        # If count is 0 (no research yet), default to a placeholder number or 0? 
-        # Let's show 0 or keep the placeholder if we want to fake "potential" sources.
-        # Requirement says "match actual number", so 0 is correct if no sources found.
-        # However, for a better demo experience if DB is empty, maybe fallback to mock?
-        # The prompt implies we WANT accuracy. So let's return the real count.
-        
-        topics.append(Topic(
-            id=config["id"],
-            label=config["label"],
-            emoji=config["emoji"],
-            article_count=count,
-            last_refreshed_at=now 
-        ))
+async def list_topics(request: Request, response: Response) -> TopicsResponse:
+    # Served from the materialized view; storage is only read to reload it.
+    view = get_topic_view()
+    await view.refresh(get_research_results)
+    topics = view.topics()
 
+    # Compared as aware UTC; max() raises on a mix of naive and aware values.
+    refreshed = [as_datetime(topic.last_refreshed_at) for topic in topics if topic.last_refreshed_at is not None]
+    etag = make_etag("topics", *[(topic.id, topic.article_count, topic.last_refreshed_at) for topic in topics])
+    not_modified = conditional_response(request, response, etag, max(refreshed, default=None))
+    if not_modified is not None:
+        return not_modified
     return TopicsResponse(topics=topics)
 
 
-@router.get("/topics/{topic_id}", response_model=TopicDetailResponse)
-async def get_topic(topic_id: str) -> TopicDetailResponse:
+@router.get("/topics/cache-stats")
+async def topic_cache_stats() -> dict:
+    return _detail_cache.stats()
+
+
+def _detail_key(topic_id: str, research: dict) -> tuple:
+    # A rewrite changes generated_at, so stale renders are never hit again
+    # and age out of the LRU.
+    return (
+        topic_id,
+        as_datetime(research.get("generated_at")),
+        bool(research.get("preview")),
+        research.get("format_version"),
+    )
+
+
+def _render_topic(topic_id: str, research: dict | None) -> TopicDetailResponse:
     from datetime import datetime, timezone
     now = datetime.now(timezone.utc)
 
     # Define topic data
-    topics_data = {
-        "politics": {"label": "US Politics", "emoji": "🇺🇸"},
-        "sports": {"label": "Sports", "emoji": "⚽"},
-        "climate": {"label": "Climate Change", "emoji": "🌍"},
-        "tech": {"label": "Tech & AI", "emoji": "🤖"},
-        "economy": {"label": "Global Economy", "emoji": "📈"},
-        "health": {"label": "Health & Science", "emoji": "🧬"},
-    }
+    topics_data = {config["id"]: config for config in TOPIC_CONFIGS}
 
     # Get data or default
     data = topics_data.get(topic_id, {"label": topic_id.capitalize(), "emoji": "📰"})
 
-    # Fetch real research
-    mapped_id = TOPIC_ID_MAPPING.get(topic_id, topic_id)
-    research = await get_research_result(mapped_id)
-    
     summary_text = f"This is a deep dive into {data['label']}."
     real_sources = []
     generated_at = now
     
     if research:
         generated_at = research.get("generated_at", now)
-        raw_summary = research.get("summary", "")
-        
-        # Try to clean up the TaskRunTextOutput string
-        if "TaskRunTextOutput" in raw_summary:
-            parsed_summary, parsed_sources = parse_task_output(raw_summary)
-            if parsed_summary:
-                summary_text = parsed_summary
-            
-            if parsed_sources:
-                real_sources = parsed_sources
-        else:
-            summary_text = raw_summary
-
-        # Clean markdown from the summary regardless of source
-        summary_text = clean_markdown(summary_text)
-        
-        # Truncate if too long
-        if len(summary_text) > 800:
-            summary_text = summary_text[:800] + "..."
-
-        # Check for explicit sources in DB (preferred if available)
+        # Parsed, cleaned and truncated when the research was stored.
+        summary_text = research.get("display_summary", "")
+
         db_sources = research.get("sources", [])
         if db_sources:
             # Convert dict sources from DB to Source objects
@@ -192,4 +98,105 @@ async def get_topic(topic_id: str) -> TopicDetailResponse:
         last_refreshed_at=generated_at,
         research_summary=summary_text,
         sources=real_sources,
+        preview=bool(research and research.get("preview")),
+    )
+
+
+# Where each TopicDetailResponse field is stored on the research document;
+# None for fields that come from the topic catalog.
+TOPIC_STORED_FIELDS = {
+    "id": None,
+    "label": None,
+    "emoji": None,
+    "article_count": "source_count",
+    "last_refreshed_at": "generated_at",
+    "research_summary": "display_summary",
+    "sources": "sources",
+    "preview": "preview",
+}
+
+
+def _partial_topic(topic_id: str, research: dict, requested: list, offset: int, paged: bool) -> dict:
+    """The requested fields of a topic page, straight from a projected read."""
+    data = next(
+        (config for config in TOPIC_CONFIGS if config["id"] == topic_id),
+        {"label": topic_id.capitalize(), "emoji": "📰"},
+    )
+    values = {
+        "id": topic_id,
+        "label": data["label"],
+        "emoji": data["emoji"],
+        "article_count": research.get("source_count") or 15,
+        "last_refreshed_at": as_datetime(research.get("generated_at")),
+        "research_summary": research.get("display_summary", ""),
+        "sources": research.get("sources") or [],
+        "preview": bool(research.get("preview")),
+    }
+    body = {field: values[field] for field in requested}
+    if paged and "sources" in body:
+        body.update(page_fields(research, offset))
+    return body
+
+
+@router.get("/topics/{topic_id}", response_model=TopicDetailResponse)
+async def get_topic(
+    topic_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    sources_limit: Optional[int] = Query(None, ge=1, le=SOURCES_PAGE_MAX),
+    sources_cursor: Optional[str] = None,
+) -> TopicDetailResponse:
+    """A topic page.
+
+    ``fields`` is a comma-separated subset of the response fields. With
+    ``sources_limit`` or ``sources_cursor`` the sources come back one page
+    at a time, with ``sources_total`` and ``next_sources_cursor`` added.
+    """
+    requested = parse_fields(fields, TopicDetailResponse.model_fields)
+    offset = parse_cursor(sources_cursor)
+    paged = sources_limit is not None or sources_cursor is not None
+    limit = (sources_limit or SOURCES_PAGE_MAX) if paged else None
+    partial = requested is not None or paged
+
+    mapped_id = TOPIC_ID_MAPPING.get(topic_id, topic_id)
+    version = await get_research_result(mapped_id, RESEARCH_VERSION_PROJECTION)
+    # Without research the placeholder page changes every request, so it
+    # gets no validators and isn't cached.
+    if not version:
+        placeholder = _render_topic(topic_id, None)
+        if not partial:
+            return placeholder
+        body = placeholder.model_dump(mode="json", include=set(requested) if requested else None)
+        if paged and "sources" in body:
+            body.update(page_fields({}, offset))
+        return JSONResponse(body)
+
+    version_at = as_datetime(version.get("generated_at"))
+    etag = make_etag(
+        "topic", topic_id, version_at, version.get("preview"), version.get("format_version"), requested, offset, limit
     )
+    not_modified = conditional_response(request, response, etag, version_at)
+    if not_modified is not None:
+        return not_modified
+
+    if partial:
+        # Partial responses skip the response model and the render cache;
+        # only the projected fields are read.
+        requested = requested or list(TOPIC_STORED_FIELDS)
+        research = await get_research_result(
+            mapped_id, storage_projection(requested, TOPIC_STORED_FIELDS, offset, limit)
+        ) or {}
+        return JSONResponse(
+            to_jsonable_python(_partial_topic(topic_id, research, requested, offset, paged)),
+            headers=cache_headers(etag, version_at),
+        )
+
+    body = _detail_cache.get(_detail_key(topic_id, version))
+    if body is None:
+        research = await get_research_result(mapped_id)
+        if not research:
+            return _render_topic(topic_id, None)
+        body = _render_topic(topic_id, research).model_dump_json()
+        _detail_cache.put(_detail_key(topic_id, research), body)
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag, version_at))
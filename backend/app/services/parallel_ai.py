@@ -1,58 +1,274 @@
 import asyncio
 import logging
 import os
-import time
-from typing import List
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
-from parallel import Parallel
+from parallel import APIConnectionError, AsyncParallel, InternalServerError, NotFoundError, RateLimitError
 from parallel.types import TaskSpecParam, TextSchemaParam
 
 from app.models.schemas import ResearchResult, Source
+from app.services.polling import PollPolicy, policy_for, record_poll_error, record_run
 
 
-_client: Parallel | None = None
+_client: AsyncParallel | None = None
 _logger = logging.getLogger(__name__)
 
+# Upper bound on status checks in flight at once across all runs.
+POLL_CONCURRENCY = int(os.getenv("PARALLEL_POLL_CONCURRENCY", "16"))
 
-def _get_client() -> Parallel:
+# Errors worth retrying with backoff; anything else fails the run.
+_TRANSIENT_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+
+def default_processor() -> str:
+    return os.getenv("PARALLEL_PROCESSOR", "ultra")
+
+
+def _get_client() -> AsyncParallel:
     global _client
     if _client is None:
         api_key = os.getenv("PARALLEL_API_KEY", "").strip()
         if not api_key:
             raise RuntimeError("PARALLEL_API_KEY is required")
-        _client = Parallel(api_key=api_key)
+        _client = AsyncParallel(api_key=api_key)
     return _client
 
 
-def _poll_for_result(client: Parallel, run_id: str, timeout_seconds: float, poll_interval: float):
-    """Poll for task result with proper timeout handling."""
-    start_time = time.time()
-    while True:
-        elapsed = time.time() - start_time
-        if elapsed >= timeout_seconds:
-            raise TimeoutError(f"Task {run_id} did not complete within {timeout_seconds} seconds")
-        
-        # Check task status
-        task_run = client.task_run.retrieve(run_id)
+@dataclass
+class _PendingRun:
+    run_id: str
+    processor: str
+    policy: PollPolicy
+    future: asyncio.Future
+    started_at: float
+    deadline: float
+    next_poll_at: float
+    polls: int = 0
+    failures: int = 0
+    checking: bool = False
+    status: Optional[str] = None
+    on_status: Optional[Callable[[str], None]] = None
+    group_id: Optional[str] = None
+
+
+class _RunPoller:
+    """Waits on every outstanding Parallel.ai run from one asyncio task.
+
+    Callers register a ``run_id`` and await a future. A single loop sleeps
+    until the next run is due, issues the due status checks concurrently
+    (bounded by ``PARALLEL_POLL_CONCURRENCY``) and resolves each future
+    with the run result, a failure or a timeout. Each run's ``PollPolicy``
+    decides when it is next due. Runs registered with a task group are
+    checked together: one ``get_runs`` stream covers every run of the group
+    waiting here. No threads are held while runs are in progress; the loop
+    exits when nothing is outstanding and restarts on the next registration.
+    """
+
+    def __init__(self, client: AsyncParallel, concurrency: int = POLL_CONCURRENCY):
+        self.client = client
+        self._runs: Dict[str, _PendingRun] = {}
+        self._checks: Set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._task: Optional[asyncio.Task] = None
+
+    def wait(
+        self,
+        run_id: str,
+        processor: str,
+        policy: PollPolicy,
+        timeout_seconds: float,
+        on_status: Optional[Callable[[str], None]] = None,
+        group_id: Optional[str] = None,
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        run = self._runs.get(run_id)
+        if run is None:
+            run = _PendingRun(
+                run_id=run_id,
+                processor=processor,
+                policy=policy,
+                future=loop.create_future(),
+                started_at=now,
+                deadline=now + timeout_seconds,
+                next_poll_at=now + policy.next_delay(0.0),
+                on_status=on_status,
+                group_id=group_id,
+            )
+            self._runs[run_id] = run
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+        self._wake.set()
+        # Shielded so one cancelled waiter doesn't fail others on the same run.
+        return asyncio.shield(run.future)
+
+    def _resolve(
+        self,
+        run: _PendingRun,
+        outcome: str,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self._runs.pop(run.run_id, None)
+        if run.future.done():
+            return
+        elapsed = asyncio.get_running_loop().time() - run.started_at
+        record_run(run.processor, outcome, run.polls, elapsed)
+        if error is not None:
+            run.future.set_exception(error)
+        else:
+            run.future.set_result(result)
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._runs:
+            now = loop.time()
+            wake_at: Optional[float] = None
+            due_groups: Set[str] = set()
+            for run in list(self._runs.values()):
+                if run.checking:
+                    continue
+                if now >= run.deadline:
+                    self._resolve(run, "timeout", error=TimeoutError(
+                        f"Task {run.run_id} did not complete within {run.deadline - run.started_at:g} seconds"
+                    ))
+                    continue
+                if now >= run.next_poll_at:
+                    if run.group_id is not None:
+                        due_groups.add(run.group_id)
+                    else:
+                        run.checking = True
+                        self._spawn(self._check(run))
+                    continue
+                due = min(run.next_poll_at, run.deadline)
+                wake_at = due if wake_at is None else min(wake_at, due)
+            for group_id in due_groups:
+                # One group check covers its runs that are not yet due too.
+                runs = [run for run in self._runs.values() if run.group_id == group_id and not run.checking]
+                for run in runs:
+                    run.checking = True
+                self._spawn(self._check_group(group_id, runs))
+            self._wake.clear()
+            timeout = None if wake_at is None else max(0.0, wake_at - loop.time())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        check = asyncio.create_task(coro)
+        self._checks.add(check)
+        check.add_done_callback(self._checks.discard)
+
+    async def _apply_status(self, run: _PendingRun, task_run: Any) -> None:
         status = getattr(task_run, "status", None)
-        _logger.info("Task %s status: %s (elapsed: %.1fs)", run_id, status, elapsed)
-        
+        elapsed = asyncio.get_running_loop().time() - run.started_at
+        _logger.info("Task %s status: %s (elapsed: %.1fs)", run.run_id, status, elapsed)
+        if status != run.status:
+            run.status = status
+            if run.on_status is not None and status:
+                run.on_status(status)
         if status == "completed":
-            # Task is complete, get the result
-            return client.task_run.result(run_id, api_timeout=30)
+            result = await self.client.task_run.result(run.run_id, api_timeout=30)
+            self._resolve(run, "completed", result=result)
         elif status == "failed":
             error_msg = getattr(task_run, "error", "Unknown error")
-            raise RuntimeError(f"Task failed: {error_msg}")
+            self._resolve(run, "failed", error=RuntimeError(f"Task failed: {error_msg}"))
         elif status in ("pending", "running", "queued"):
-            # Still processing, wait and poll again
-            time.sleep(poll_interval)
+            run.failures = 0
         else:
             # Unknown status, try to get result anyway
             _logger.warning("Unknown task status: %s, attempting to get result", status)
             try:
-                return client.task_run.result(run_id, api_timeout=30)
-            except Exception:
-                time.sleep(poll_interval)
+                result = await self.client.task_run.result(run.run_id, api_timeout=30)
+            except Exception:  # noqa: BLE001
+                run.failures += 1
+            else:
+                self._resolve(run, "completed", result=result)
+
+    def _check_failed(self, run: _PendingRun, exc: Exception) -> None:
+        if isinstance(exc, _TRANSIENT_ERRORS):
+            run.failures += 1
+            record_poll_error(run.processor)
+            _logger.warning("Polling task %s failed (attempt %d), backing off: %s", run.run_id, run.failures, exc)
+        else:
+            self._resolve(run, "error", error=exc)
+
+    def _checked(self, run: _PendingRun) -> None:
+        loop = asyncio.get_running_loop()
+        run.checking = False
+        run.next_poll_at = loop.time() + run.policy.next_delay(loop.time() - run.started_at, run.failures)
+        self._wake.set()
+
+    async def _check(self, run: _PendingRun) -> None:
+        try:
+            async with self._semaphore:
+                run.polls += 1
+                await self._apply_status(run, await self.client.task_run.retrieve(run.run_id))
+        except Exception as exc:  # noqa: BLE001
+            self._check_failed(run, exc)
+        finally:
+            self._checked(run)
+
+    async def _check_group(self, group_id: str, runs: List[_PendingRun]) -> None:
+        by_id = {run.run_id: run for run in runs}
+        try:
+            async with self._semaphore:
+                for run in runs:
+                    run.polls += 1
+                stream = await self.client.task_group.get_runs(group_id, timeout=30)
+                async for event in stream:
+                    task_run = getattr(event, "run", None)
+                    run = by_id.get(getattr(task_run, "run_id", None))
+                    if run is None or run.future.done():
+                        continue
+                    try:
+                        await self._apply_status(run, task_run)
+                    except Exception as exc:  # noqa: BLE001
+                        self._check_failed(run, exc)
+        except NotFoundError:
+            # Without the group, each run is checked (and found gone or not) on its own.
+            _logger.warning("Task group %s no longer exists, polling its runs individually", group_id)
+            for run in runs:
+                run.group_id = None
+        except Exception as exc:  # noqa: BLE001
+            for run in runs:
+                self._check_failed(run, exc)
+        finally:
+            for run in runs:
+                self._checked(run)
+
+    async def close(self) -> None:
+        tasks = [task for task in (self._task, *self._checks) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for run in list(self._runs.values()):
+            run.future.cancel()
+        self._runs.clear()
+
+
+_poller: _RunPoller | None = None
+
+
+def _get_poller() -> _RunPoller:
+    global _poller
+    if _poller is None:
+        _poller = _RunPoller(_get_client())
+    return _poller
+
+
+async def close_poller() -> None:
+    """Stop polling and close the async client; called on app shutdown."""
+    global _poller, _client
+    if _poller is not None:
+        await _poller.close()
+        _poller = None
+    if _client is not None:
+        await _client.close()
+        _client = None
 
 
 def _normalize_sources(raw_sources) -> List[Source]:
@@ -74,89 +290,140 @@ def _normalize_sources(raw_sources) -> List[Source]:
     return sources
 
 
+def _parse_result(run_result) -> ResearchResult:
+    output = getattr(run_result, "output", None)
+    summary = ""
+    sources: List[Source] = []
+
+    if isinstance(output, dict):
+        summary = output.get("summary") or output.get("answer") or ""
+        sources = _normalize_sources(output.get("sources") or output.get("results"))
+    else:
+        # Handle TaskRunTextOutput or similar objects with content/citations
+        content = getattr(output, "content", None)
+        citations = getattr(output, "citations", None)
+
+        if content is not None:
+            summary = str(content)
+        else:
+            summary = str(output) if output is not None else ""
+
+        # Extract sources from citations if available
+        if citations and isinstance(citations, list):
+            for citation in citations:
+                url = getattr(citation, "url", None) or (citation.get("url") if isinstance(citation, dict) else None)
+                title = getattr(citation, "title", None) or (citation.get("title") if isinstance(citation, dict) else None)
+                if url:
+                    sources.append(Source(
+                        title=title or "Source",
+                        url=url,
+                        snippet=None,
+                        source_name=None,
+                        published_at=None,
+                    ))
+
+    return ResearchResult(summary=summary, sources=sources)
+
+
+async def _create_run(client: AsyncParallel, query: str, processor: str) -> str:
+    _logger.info("Creating Parallel.ai task with processor=%s for query: %s", processor, query[:100])
+    task_run = await client.task_run.create(
+        input=query,
+        processor=processor,
+        task_spec=TaskSpecParam(output_schema=TextSchemaParam()),
+    )
+    _logger.info("Task created with run_id=%s", task_run.run_id)
+    return task_run.run_id
+
+
+async def create_run_group(queries: List[str], processor: str | None = None) -> Tuple[str, List[str]]:
+    """Create one run per query in a new task group, with a single ``add_runs`` request.
+
+    Returns the group id and the run ids in query order; pass both to
+    ``run_task`` to wait on a run with the rest of its group.
+    """
+    processor = processor or default_processor()
+    client = _get_client()
+    group = await client.task_group.create()
+    response = await client.task_group.add_runs(
+        group.task_group_id,
+        inputs=[{"input": query, "processor": processor} for query in queries],
+        default_task_spec=TaskSpecParam(output_schema=TextSchemaParam()),
+    )
+    _logger.info("Task group %s created with %d runs (processor=%s)", group.task_group_id, len(response.run_ids), processor)
+    return group.task_group_id, list(response.run_ids)
+
+
 async def run_task(
     query: str,
     limit: int = 10,
-    poll_interval: float = 3.0,
+    poll_interval: float | None = None,
     timeout_seconds: float | None = None,
+    run_id: str | None = None,
+    processor: str | None = None,
+    on_created: Callable[[str, str], Awaitable[None]] | None = None,
+    on_status: Callable[[str], None] | None = None,
+    group_id: str | None = None,
 ) -> ResearchResult:
     """Run a research task with proper polling for long-running tasks.
     
-    The Parallel.ai 'ultra' processor can take several minutes, so we use
-    polling instead of a single blocking call.
+    The Parallel.ai 'ultra' processor can take several minutes, so the run
+    is handed to the shared async poller instead of a single blocking call.
     
     Timeout can be configured via PARALLEL_TIMEOUT_SECONDS environment variable.
-    Default is 300 seconds (5 minutes) for ultra processor.
+    Default is 300 seconds (5 minutes) for ultra processor. Poll timing
+    follows the processor's ``PollPolicy``; ``poll_interval`` overrides its
+    minimum interval.
+
+    Pass ``run_id`` (and the ``processor`` it was created with) to resume
+    waiting on an existing run instead of starting a new one; if the run no
+    longer exists upstream a new one is created. ``on_created`` is awaited
+    with ``(run_id, processor)`` as soon as a new run exists, so callers can
+    persist it before the long wait. ``on_status`` is called with each new
+    upstream run status the poller observes. ``group_id`` is the task group
+    a resumed run belongs to, so it is polled with the rest of the group.
     """
-    processor = os.getenv("PARALLEL_PROCESSOR", "ultra")
+    processor = processor or default_processor()
     
     # Get timeout from env or use default based on processor
     if timeout_seconds is None:
         default_timeout = 300.0 if processor == "ultra" else 120.0
         timeout_seconds = float(os.getenv("PARALLEL_TIMEOUT_SECONDS", str(default_timeout)))
+    policy = policy_for(processor)
+    if poll_interval is not None:
+        policy = replace(policy, min_interval=poll_interval, max_interval=max(policy.max_interval, poll_interval))
 
-    def _run() -> ResearchResult:
-        try:
-            client = _get_client()
-            _logger.info("Creating Parallel.ai task with processor=%s for query: %s", processor, query[:100])
-            
-            task_run = client.task_run.create(
-                input=query,
-                processor=processor,
-                task_spec=TaskSpecParam(output_schema=TextSchemaParam()),
-            )
-            run_id = task_run.run_id
-            _logger.info("Task created with run_id=%s", run_id)
-            
+    try:
+        client = _get_client()
+        run_result = None
+        if run_id:
+            _logger.info("Resuming Parallel.ai run %s (processor=%s)", run_id, processor)
+            try:
+                run_result = await _get_poller().wait(
+                    run_id, processor, policy, timeout_seconds, on_status, group_id=group_id
+                )
+            except NotFoundError:
+                _logger.warning("Parallel.ai run %s no longer exists, starting a new run", run_id)
+        if run_result is None:
+            run_id = await _create_run(client, query, processor)
+            if on_created is not None:
+                await on_created(run_id, processor)
             # Poll for result instead of using blocking api_timeout
-            run_result = _poll_for_result(client, run_id, timeout_seconds, poll_interval)
-
-            output = getattr(run_result, "output", None)
-            summary = ""
-            sources: List[Source] = []
-
-            if isinstance(output, dict):
-                summary = output.get("summary") or output.get("answer") or ""
-                sources = _normalize_sources(output.get("sources") or output.get("results"))
-            else:
-                # Handle TaskRunTextOutput or similar objects with content/citations
-                content = getattr(output, "content", None)
-                citations = getattr(output, "citations", None)
-                
-                if content is not None:
-                    summary = str(content)
-                else:
-                    summary = str(output) if output is not None else ""
-                
-                # Extract sources from citations if available
-                if citations and isinstance(citations, list):
-                    for citation in citations:
-                        url = getattr(citation, "url", None) or (citation.get("url") if isinstance(citation, dict) else None)
-                        title = getattr(citation, "title", None) or (citation.get("title") if isinstance(citation, dict) else None)
-                        if url:
-                            sources.append(Source(
-                                title=title or "Source",
-                                url=url,
-                                snippet=None,
-                                source_name=None,
-                                published_at=None,
-                            ))
-
-            _logger.info("Task %s completed successfully with %d sources", run_id, len(sources))
-            return ResearchResult(summary=summary, sources=sources)
-        except TimeoutError as exc:
-            _logger.error("Parallel.ai task timed out: %s", exc)
-            raise
-        except Exception as exc:  # noqa: BLE001
-            response = getattr(exc, "response", None)
-            if response is not None:
-                status = getattr(response, "status_code", "unknown")
-                body = getattr(response, "text", None)
-                _logger.error("Parallel.ai error status=%s body=%s", status, body)
-            _logger.exception("Parallel.ai request failed")
-            raise
-
-    return await asyncio.to_thread(_run)
+            run_result = await _get_poller().wait(run_id, processor, policy, timeout_seconds, on_status)
+        result = _parse_result(run_result)
+        _logger.info("Task %s completed successfully with %d sources", run_id, len(result.sources))
+        return result
+    except TimeoutError as exc:
+        _logger.error("Parallel.ai task timed out: %s", exc)
+        raise
+    except Exception as exc:  # noqa: BLE001
+        response = getattr(exc, "response", None)
+        if response is not None:
+            status = getattr(response, "status_code", "unknown")
+            body = getattr(response, "text", None)
+            _logger.error("Parallel.ai error status=%s body=%s", status, body)
+        _logger.exception("Parallel.ai request failed")
+        raise
 
 
 async def search_sources(query: str, limit: int = 10) -> List[Source]:
@@ -0,0 +1,133 @@
+import os
+import random
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+# Rough wall-clock time a run takes on each Parallel.ai processor. Polling
+# is sparse early on and tightens as a run approaches this.
+EXPECTED_SECONDS = {
+    "lite": 15.0,
+    "base": 30.0,
+    "core": 60.0,
+    "pro": 120.0,
+    "ultra": 180.0,
+}
+
+POLL_MIN_SECONDS = float(os.getenv("PARALLEL_POLL_MIN_SECONDS", "2"))
+POLL_MAX_SECONDS = float(os.getenv("PARALLEL_POLL_MAX_SECONDS", "30"))
+POLL_JITTER = float(os.getenv("PARALLEL_POLL_JITTER", "0.2"))
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    """When to check a run next, given how long it has been running.
+
+    Before ``expected_seconds`` the delay is half the time left, so checks
+    start sparse and bunch up near the expected finish. Past it, the delay
+    grows again with how overdue the run is. Consecutive errors or unknown
+    statuses back off exponentially. Every delay is clamped to
+    ``[min_interval, max_interval]`` and jittered so runs started together
+    don't poll in lockstep.
+    """
+
+    expected_seconds: float
+    min_interval: float = POLL_MIN_SECONDS
+    max_interval: float = POLL_MAX_SECONDS
+    backoff: float = 2.0
+    jitter: float = POLL_JITTER
+
+    def next_delay(self, elapsed: float, failures: int = 0) -> float:
+        if failures:
+            delay = self.min_interval * self.backoff ** failures
+        elif elapsed < self.expected_seconds:
+            delay = (self.expected_seconds - elapsed) / 2
+        else:
+            delay = self.min_interval + (elapsed - self.expected_seconds) / 4
+        delay = min(self.max_interval, max(self.min_interval, delay))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+def policy_for(processor: str) -> PollPolicy:
+    # Overridden per processor, e.g. PARALLEL_EXPECTED_SECONDS_ULTRA, so the
+    # main and preview processors keep their own schedules.
+    override = os.getenv(f"PARALLEL_EXPECTED_SECONDS_{processor.upper().replace('-', '_')}", "").strip()
+    if override:
+        expected = float(override)
+    else:
+        expected = EXPECTED_SECONDS.get(processor, EXPECTED_SECONDS["ultra"])
+    return PollPolicy(expected_seconds=expected)
+
+
+class Histogram:
+    """Fixed-bucket counts; bucket ``b`` holds values ``<= b`` and above the previous bound."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"{bound:g}" for bound in self.bounds] + ["+Inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "sum": round(self.total, 3),
+        }
+
+
+POLL_COUNT_BOUNDS = [1, 2, 3, 5, 8, 13, 21, 34, 55]
+COMPLETION_SECONDS_BOUNDS = [10, 30, 60, 120, 180, 300, 600, 900, 1800]
+
+_stats: Dict[str, Dict[str, Any]] = {}
+_stats_lock = threading.Lock()
+
+
+def _processor_stats(processor: str) -> Dict[str, Any]:
+    stats = _stats.get(processor)
+    if stats is None:
+        stats = {
+            "polls_per_task": Histogram(POLL_COUNT_BOUNDS),
+            "completion_seconds": Histogram(COMPLETION_SECONDS_BOUNDS),
+            "outcomes": {},
+            "errors": 0,
+        }
+        _stats[processor] = stats
+    return stats
+
+
+def record_poll_error(processor: str) -> None:
+    with _stats_lock:
+        _processor_stats(processor)["errors"] += 1
+
+
+def record_run(processor: str, outcome: str, polls: int, elapsed: float) -> None:
+    """Record a finished run; completion time only counts successful runs."""
+    with _stats_lock:
+        stats = _processor_stats(processor)
+        stats["polls_per_task"].observe(polls)
+        if outcome == "completed":
+            stats["completion_seconds"].observe(elapsed)
+        stats["outcomes"][outcome] = stats["outcomes"].get(outcome, 0) + 1
+
+
+def polling_stats(processor: Optional[str] = None) -> Dict[str, Any]:
+    with _stats_lock:
+        names: List[str] = [processor] if processor else sorted(_stats)
+        return {
+            name: {
+                "polls_per_task": _stats[name]["polls_per_task"].snapshot(),
+                "completion_seconds": _stats[name]["completion_seconds"].snapshot(),
+                "outcomes": dict(_stats[name]["outcomes"]),
+                "errors": _stats[name]["errors"],
+            }
+            for name in names
+            if name in _stats
+        }
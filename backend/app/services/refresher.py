@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List
+
+from app.services.research import (
+    PRIORITY_SCHEDULED,
+    as_datetime,
+    get_research_results,
+    start_research_task,
+)
+from app.services.scheduler import get_scheduler
+
+
+_logger = logging.getLogger(__name__)
+
+# Research older than this is refreshed in the background; 0 disables the refresher.
+MAX_AGE_SECONDS = float(os.getenv("RESEARCH_MAX_AGE_SECONDS", str(6 * 3600)))
+CHECK_INTERVAL_SECONDS = float(os.getenv("RESEARCH_REFRESH_CHECK_SECONDS", "60"))
+# Minimum gap between two background refreshes starting.
+STAGGER_SECONDS = float(os.getenv("RESEARCH_REFRESH_STAGGER_SECONDS", "30"))
+# A topic whose refresh was just started isn't retried before this elapses,
+# so a failing topic doesn't start a paid run on every check.
+RETRY_SECONDS = float(os.getenv("RESEARCH_REFRESH_RETRY_SECONDS", "900"))
+
+
+class TopicRefresher:
+    """Keeps the built-in topics' research younger than ``MAX_AGE_SECONDS``.
+
+    Each check reads every topic's ``generated_at`` in one query and queues
+    a scheduled-priority refresh for the stale ones, oldest first, at most
+    one per ``STAGGER_SECONDS``. Reads are not involved: the existing
+    research document keeps being served until the new run overwrites it,
+    and a failed run leaves it in place.
+    """
+
+    def __init__(self, topic_ids: Iterable[str]):
+        self.topic_ids = list(dict.fromkeys(topic_ids))
+        self._last_started: Dict[str, datetime] = {}
+
+    async def stale_topics(self, now: datetime) -> List[str]:
+        docs = await get_research_results(self.topic_ids, {"topic_id": 1, "generated_at": 1})
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        cutoff = now - timedelta(seconds=MAX_AGE_SECONDS)
+        ages = []
+        for topic_id in self.topic_ids:
+            generated_at = as_datetime((docs.get(topic_id) or {}).get("generated_at")) or oldest
+            if generated_at >= cutoff:
+                continue
+            last_started = self._last_started.get(topic_id)
+            if last_started is not None and now - last_started < timedelta(seconds=RETRY_SECONDS):
+                continue
+            ages.append((generated_at, topic_id))
+        return [topic_id for _, topic_id in sorted(ages)]
+
+    async def refresh_stale(self) -> int:
+        started = 0
+        for topic_id in await self.stale_topics(datetime.now(timezone.utc)):
+            if started:
+                await asyncio.sleep(STAGGER_SECONDS)
+            self._last_started[topic_id] = datetime.now(timezone.utc)
+            # Single-flight: a refresh already in progress for the topic is reused.
+            task, created = await start_research_task(topic_id, topic_id, priority=PRIORITY_SCHEDULED)
+            if created and not task.get("cache_hit"):
+                get_scheduler().submit(task["_id"], PRIORITY_SCHEDULED)
+                _logger.info("Started background refresh %s for stale topic %r", task["_id"], topic_id)
+                started += 1
+        return started
+
+    async def run(self) -> None:
+        if MAX_AGE_SECONDS <= 0:
+            return
+        # Workers started together shouldn't check in lockstep.
+        await asyncio.sleep(random.uniform(0, min(CHECK_INTERVAL_SECONDS, STAGGER_SECONDS)))
+        while True:
+            try:
+                await self.refresh_stale()
+            except Exception:  # noqa: BLE001
+                _logger.exception("Background topic refresh failed")
+            await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+
+
+async def run_topic_refresher(topic_ids: Iterable[str]) -> None:
+    """Refresh stale topics until cancelled; no-op when RESEARCH_MAX_AGE_SECONDS is 0."""
+    await TopicRefresher(topic_ids).run()
@@ -1,30 +1,248 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from app.db.mongodb import get_database
-from pymongo.errors import PyMongoError, ServerSelectionTimeoutError
+from app.db.mongodb import compact_collection, get_database
+from pymongo.errors import DuplicateKeyError, PyMongoError, ServerSelectionTimeoutError
 import re
 from app.models.schemas import ResearchResult, Source
-from app.services.parallel_ai import run_task
+from app.services.parallel_ai import create_run_group, default_processor, run_task
+from app.services.task_events import publish
+from app.services.text import clean_markdown, parse_task_output
+from app.services.timestamps import as_datetime
+from app.services.topic_view import get_topic_view
+from app.services.write_behind import WriteBehindBuffer
 
 
 TASK_COLLECTION = "research_tasks"
 RESEARCH_COLLECTION = "research"
+CACHE_COLLECTION = "research_cache"
+BATCH_COLLECTION = "research_batches"
 _in_memory_tasks: Dict[str, Dict[str, Any]] = {}
+_in_memory_batches: Dict[str, Dict[str, Any]] = {}
+_logger = logging.getLogger(__name__)
+
+# Retention for finished tasks; 0 disables the TTL or the per-topic cap.
+TERMINAL_STATUSES = ("complete", "error")
+ACTIVE_STATUSES = ("queued", "running")
+TASK_TTL_SECONDS = float(os.getenv("RESEARCH_TASK_TTL_SECONDS", str(7 * 24 * 3600)))
+TASK_KEEP_PER_TOPIC = int(os.getenv("RESEARCH_TASK_KEEP_PER_TOPIC", "20"))
+TASK_SWEEP_INTERVAL_SECONDS = float(os.getenv("RESEARCH_TASK_SWEEP_INTERVAL_SECONDS", "3600"))
+
+# Optional write-behind for task status updates; terminal states always flush.
+TASK_WRITE_BEHIND = os.getenv("RESEARCH_TASK_WRITE_BEHIND", "").strip().lower() in {"1", "true", "yes"}
+TASK_FLUSH_INTERVAL_SECONDS = float(os.getenv("RESEARCH_TASK_FLUSH_INTERVAL_SECONDS", "1.0"))
+TASK_FLUSH_MAX_DIRTY = int(os.getenv("RESEARCH_TASK_FLUSH_MAX_DIRTY", "100"))
+
+# An active task not updated for this long is presumed abandoned (its worker
+# died) and no longer blocks new refreshes of the topic.
+TASK_STALE_SECONDS = float(os.getenv("RESEARCH_TASK_STALE_SECONDS", "1800"))
+# Per-topic locks, dropped once nobody holds or waits on them.
+_topic_locks: Dict[str, asyncio.Lock] = {}
+_topic_lock_users: Dict[str, int] = {}
+
+# Finished results are reused for an identical query and processor, under
+# any topic, for this long; 0 disables the cache.
+CACHE_TTL_SECONDS = float(os.getenv("RESEARCH_CACHE_TTL_SECONDS", "1800"))
+
+# Progressive mode: a fast processor run alongside the main one, stored as a
+# preview until the main result replaces it. Empty disables it. By default
+# only topics without research get a preview; stale ones keep serving the
+# previous full result.
+PREVIEW_PROCESSOR = os.getenv("RESEARCH_PREVIEW_PROCESSOR", "lite").strip()
+PREVIEW_ALWAYS = os.getenv("RESEARCH_PREVIEW_ALWAYS", "").strip().lower() in {"1", "true", "yes"}
+_preview_tasks: set = set()
+
+# Research documents are stored parsed (see ``canonical_research``); older
+# documents are rewritten by ``backfill_research`` on startup.
+RESEARCH_FORMAT_VERSION = 1
+DISPLAY_SUMMARY_CHARS = 800
+
+# Queue priorities for the research scheduler; lower runs first.
+PRIORITY_USER = 0
+PRIORITY_SCHEDULED = 10
+
+# Tasks record the worker process that will run them so a restarted worker
+# can tell its own orphans from tasks another live worker is running.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
 
 
 def _tasks_collection():
     return get_database()[TASK_COLLECTION]
 
 
+_task_writes: Optional[WriteBehindBuffer] = (
+    WriteBehindBuffer(_tasks_collection, TASK_FLUSH_INTERVAL_SECONDS, TASK_FLUSH_MAX_DIRTY)
+    if TASK_WRITE_BEHIND
+    else None
+)
+
+
+def _with_pending(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay updates still buffered by write-behind on a stored task."""
+    pending = _task_writes.pending(task["_id"]) if _task_writes is not None else None
+    if pending:
+        task.update(pending)
+    return task
+
+
 def _research_collection():
     return get_database()[RESEARCH_COLLECTION]
 
 
-async def create_research_task(topic_id: str, query: str) -> str:
+def _cache_collection():
+    return get_database()[CACHE_COLLECTION]
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _cache_key(query: str, processor: str) -> str:
+    return hashlib.sha256(f"{processor}\n{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+
+async def get_cached_result(query: str, processor: str) -> Optional[Dict[str, Any]]:
+    """Return the cached ``{summary, sources, generated_at}`` if still fresh."""
+    if CACHE_TTL_SECONDS <= 0:
+        return None
+    try:
+        entry = await _cache_collection().find_one({"_id": _cache_key(query, processor)})
+    except ServerSelectionTimeoutError:
+        return None
+    generated_at = as_datetime((entry or {}).get("generated_at"))
+    if generated_at is None or datetime.now(timezone.utc) - generated_at > timedelta(seconds=CACHE_TTL_SECONDS):
+        return None
+    return entry
+
+
+async def _cache_result(query: str, processor: str, summary: str, sources: List[Dict[str, Any]], generated_at: datetime) -> None:
+    if CACHE_TTL_SECONDS <= 0:
+        return
+    try:
+        await _cache_collection().update_one(
+            {"_id": _cache_key(query, processor)},
+            {
+                "$set": {
+                    "query": normalize_query(query),
+                    "processor": processor,
+                    "summary": summary,
+                    "sources": sources,
+                    "generated_at": generated_at,
+                }
+            },
+            upsert=True,
+        )
+    except ServerSelectionTimeoutError:
+        pass
+
+
+def canonical_research(summary: str, sources: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Parse raw run output into the fields stored on a research document.
+
+    ``summary`` may be the ``TaskRunTextOutput(...)`` repr older runs stored;
+    its content and citations are extracted here so readers never have to.
+    ``display_summary`` is the markdown-free text the topic pages show.
+    """
+    text = summary or ""
+    parsed_sources: List[Source] = []
+    if "TaskRunTextOutput" in text:
+        text, parsed_sources = parse_task_output(text)
+        text = normalize_research_summary(text)
+    sources = list(sources or []) or [source.model_dump() for source in parsed_sources]
+
+    display_summary = clean_markdown(text)
+    if len(display_summary) > DISPLAY_SUMMARY_CHARS:
+        display_summary = display_summary[:DISPLAY_SUMMARY_CHARS] + "..."
+    return {
+        "summary": text,
+        "display_summary": display_summary,
+        "sources": sources,
+        "source_count": len(sources),
+        "format_version": RESEARCH_FORMAT_VERSION,
+    }
+
+
+async def _save_research(
+    topic_id: str,
+    summary: str,
+    sources: List[Dict[str, Any]],
+    generated_at: datetime,
+    preview: bool = False,
+) -> Dict[str, Any]:
+    """Store the canonical form of a result for ``topic_id`` and return it."""
+    record = canonical_research(summary, sources)
+    try:
+        await _research_collection().update_one(
+            {"topic_id": topic_id},
+            {
+                "$set": {
+                    "topic_id": topic_id,
+                    **record,
+                    "generated_at": generated_at,
+                    "preview": preview,
+                }
+            },
+            upsert=True,
+        )
+    except ServerSelectionTimeoutError:
+        pass
+    get_topic_view().apply(topic_id, record["source_count"], generated_at)
+    return record
+
+
+async def backfill_research() -> int:
+    """Rewrite research documents stored before ``canonical_research`` existed.
+
+    Only documents with an older ``format_version`` are touched, so this is
+    a no-op once every document has been converted.
+    """
+    collection = _research_collection()
+    try:
+        docs = await collection.find(
+            {"format_version": {"$ne": RESEARCH_FORMAT_VERSION}},
+            {"topic_id": 1, "summary": 1, "sources": 1},
+        ).to_list(length=None)
+        for doc in docs:
+            record = canonical_research(doc.get("summary") or "", doc.get("sources"))
+            await collection.update_one({"topic_id": doc["topic_id"]}, {"$set": record})
+    except ServerSelectionTimeoutError:
+        return 0
+    if docs:
+        get_topic_view().invalidate()
+        _logger.info("Backfilled %d research documents", len(docs))
+    return len(docs)
+
+
+async def ensure_indexes() -> None:
+    """Declare the indexes behind the service's point lookups.
+
+    ``_id`` is indexed by every backend already, so only ``topic_id`` needs
+    declaring. An unreachable MongoDB is tolerated here; requests fall back
+    to ``_in_memory_tasks`` as usual. Research saved before the unique index
+    existed may repeat a ``topic_id``; then a plain index is created instead
+    so startup still succeeds.
+    """
+    try:
+        await _tasks_collection().create_index("topic_id")
+        try:
+            await _research_collection().create_index("topic_id", unique=True)
+        except (ValueError, DuplicateKeyError) as exc:
+            _logger.warning("Research has duplicate topic_id values, indexing topic_id without uniqueness: %s", exc)
+            await _research_collection().create_index("topic_id")
+    except ServerSelectionTimeoutError:
+        pass
+
+
+async def create_research_task(topic_id: str, query: str, priority: int = PRIORITY_USER) -> str:
     task_id = str(uuid4())
     now = datetime.now(timezone.utc)
     try:
@@ -35,6 +253,8 @@ async def create_research_task(topic_id: str, query: str) -> str:
                 "topic_id": topic_id,
                 "query": query,
                 "status": "queued",
+                "priority": priority,
+                "owner": WORKER_ID,
                 "created_at": now,
                 "updated_at": now,
             }
@@ -46,6 +266,8 @@ async def create_research_task(topic_id: str, query: str) -> str:
             "topic_id": topic_id,
             "query": query,
             "status": "queued",
+            "priority": priority,
+            "owner": WORKER_ID,
             "created_at": now,
             "updated_at": now,
             "storage": "memory",
@@ -55,24 +277,287 @@ async def create_research_task(topic_id: str, query: str) -> str:
     return task_id
 
 
+def _is_live(task: Dict[str, Any], now: datetime) -> bool:
+    if task.get("status") not in ACTIVE_STATUSES:
+        return False
+    updated_at = as_datetime(task.get("updated_at"))
+    return updated_at is None or now - updated_at < timedelta(seconds=TASK_STALE_SECONDS)
+
+
+async def find_active_task(topic_id: str) -> Optional[Dict[str, Any]]:
+    """Return the newest queued or running task for ``topic_id``, if any."""
+    now = datetime.now(timezone.utc)
+    for task in _in_memory_tasks.values():
+        if task.get("topic_id") == topic_id and _is_live(task, now):
+            return task
+    try:
+        tasks = (
+            await _tasks_collection()
+            .find({"topic_id": topic_id, "status": {"$in": list(ACTIVE_STATUSES)}})
+            .sort("created_at", -1)
+            .to_list(length=None)
+        )
+    except ServerSelectionTimeoutError:
+        return None
+    return next((task for task in map(_with_pending, tasks) if _is_live(task, now)), None)
+
+
+@asynccontextmanager
+async def _topic_lock(topic_id: str):
+    lock = _topic_locks.setdefault(topic_id, asyncio.Lock())
+    _topic_lock_users[topic_id] = _topic_lock_users.get(topic_id, 0) + 1
+    try:
+        async with lock:
+            yield
+    finally:
+        _topic_lock_users[topic_id] -= 1
+        if not _topic_lock_users[topic_id]:
+            del _topic_lock_users[topic_id]
+            del _topic_locks[topic_id]
+
+
+async def start_research_task(
+    topic_id: str,
+    query: str,
+    force: bool = False,
+    priority: int = PRIORITY_USER,
+) -> Tuple[Dict[str, Any], bool]:
+    """Single-flight entry point for refreshes.
+
+    Returns ``(task, created)``. While a topic has a queued or running task,
+    further refreshes attach to it instead of paying for another upstream
+    run, unless ``force`` is set. The per-topic lock makes the check and the
+    insert atomic within this process.
+
+    If the same query finished on the current processor within
+    ``CACHE_TTL_SECONDS`` (under any topic), the new task is completed from
+    that result straight away and marked ``cache_hit``; it needs no worker.
+    ``force`` skips the cache too.
+    """
+    async with _topic_lock(topic_id):
+        if not force:
+            active = await find_active_task(topic_id)
+            if active is not None:
+                return active, False
+        task_id = await create_research_task(topic_id, query, priority=priority)
+        cached = None if force else await get_cached_result(query, default_processor())
+        if cached is None:
+            return {"_id": task_id, "task_id": task_id, "topic_id": topic_id, "status": "queued"}, True
+
+        record = await _save_research(
+            topic_id, cached.get("summary") or "", cached.get("sources") or [], as_datetime(cached.get("generated_at"))
+        )
+        updates = {
+            "status": "complete",
+            "result": {"summary": record["summary"], "sources": record["sources"]},
+            "error": None,
+            "cache_hit": True,
+        }
+        await update_research_task(task_id, updates)
+        return {"_id": task_id, "task_id": task_id, "topic_id": topic_id, **updates}, True
+
+
+def _owner_alive(owner: Any) -> Optional[bool]:
+    """Whether the worker that owns a task is still running, if knowable.
+
+    Only workers on this host can be checked; ``None`` means unknown.
+    """
+    if not isinstance(owner, str) or ":" not in owner:
+        return False
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname():
+        return None
+    if not pid.isdigit() or int(pid) == os.getpid():
+        # Our own pid on a fresh start means a previous process reused it.
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+async def claim_orphaned_tasks() -> List[Dict[str, Any]]:
+    """Take over queued or running tasks whose worker has gone away.
+
+    A task is orphaned when its owner is a dead process on this host, or
+    when it belongs to another host and has gone ``TASK_STALE_SECONDS``
+    without an update. Each claim is a compare-and-set on the previous
+    owner and ``updated_at``, so concurrent restarts claim a task once.
+    Claimed tasks are reset to ``queued`` and owned by this worker.
+    """
+    now = datetime.now(timezone.utc)
+    claimed: List[Dict[str, Any]] = []
+    try:
+        collection = _tasks_collection()
+        tasks = await collection.find({"status": {"$in": list(ACTIVE_STATUSES)}}).sort("created_at", 1).to_list(length=None)
+        for task in tasks:
+            # The compare-and-set is against what is stored, not what is buffered.
+            stored = {"_id": task["_id"], "owner": task.get("owner"), "updated_at": task.get("updated_at")}
+            if _with_pending(task).get("status") not in ACTIVE_STATUSES:
+                continue
+            alive = _owner_alive(task.get("owner"))
+            if alive is None:
+                alive = _is_live(task, now)
+            if alive:
+                continue
+            result = await collection.update_one(
+                stored,
+                {"$set": {"status": "queued", "owner": WORKER_ID, "updated_at": now}},
+            )
+            if result.modified_count:
+                task.update(status="queued", owner=WORKER_ID, updated_at=now)
+                claimed.append(task)
+    except ServerSelectionTimeoutError:
+        pass
+    return claimed
+
+
 async def get_research_task(task_id: str) -> Optional[Dict[str, Any]]:
     if task_id in _in_memory_tasks:
         return _in_memory_tasks.get(task_id)
     try:
-        return await _tasks_collection().find_one({"_id": task_id})
+        task = await _tasks_collection().find_one({"_id": task_id})
     except ServerSelectionTimeoutError:
         return _in_memory_tasks.get(task_id)
+    return _with_pending(task) if task is not None else None
+
+
+async def get_research_tasks(task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch several tasks in one query, keyed by ``_id``."""
+    tasks = {task_id: _in_memory_tasks[task_id] for task_id in task_ids if task_id in _in_memory_tasks}
+    stored_ids = [task_id for task_id in task_ids if task_id not in tasks]
+    if stored_ids:
+        try:
+            docs = await _tasks_collection().find({"_id": {"$in": stored_ids}}).to_list(length=None)
+        except ServerSelectionTimeoutError:
+            docs = []
+        for task in docs:
+            tasks[task["_id"]] = _with_pending(task)
+    return tasks
+
+
+async def start_research_batch(
+    items: List[Tuple[str, str, bool]],
+    priority: int = PRIORITY_USER,
+) -> Tuple[str, List[Tuple[Dict[str, Any], bool]]]:
+    """Start (or attach to) a refresh for every ``(topic_id, query, force)`` at once.
+
+    Each topic goes through ``start_research_task``, so single-flight and
+    the query cache apply per topic; a topic listed twice is refreshed once,
+    with its last entry. The upstream runs of the new tasks are created
+    together in one task group (see ``_start_group_runs``). The batch record
+    maps topic ids to task ids for ``get_research_batch``.
+    """
+    unique = list({topic_id: (topic_id, query, force) for topic_id, query, force in items}.values())
+    started = await asyncio.gather(
+        *(start_research_task(topic_id, query, force=force, priority=priority) for topic_id, query, force in unique)
+    )
+    await _start_group_runs(
+        [
+            (task["_id"], query)
+            for (_, query, _), (task, created) in zip(unique, started)
+            if created and not task.get("cache_hit")
+        ]
+    )
+    batch_id = str(uuid4())
+    batch = {
+        "_id": batch_id,
+        "batch_id": batch_id,
+        "tasks": [{"topic_id": item[0], "task_id": task["_id"]} for item, (task, _) in zip(unique, started)],
+        "created_at": datetime.now(timezone.utc),
+    }
+    try:
+        await get_database()[BATCH_COLLECTION].insert_one(batch)
+    except ServerSelectionTimeoutError:
+        _in_memory_batches[batch_id] = {**batch, "storage": "memory"}
+    except PyMongoError as exc:
+        raise RuntimeError(f"MongoDB error: {exc}") from exc
+    return batch_id, list(started)
+
 
+async def _start_group_runs(tasks: List[Tuple[str, str]]) -> None:
+    """Create the runs for ``(task_id, query)`` pairs in one Parallel.ai task group.
+
+    Each task records its run the way ``run_research_task`` does, so the
+    worker resumes it and polls it with the rest of the group. If the group
+    can't be created, the workers start one run each as usual.
+    """
+    if len(tasks) < 2:
+        return
+    processor = default_processor()
+    try:
+        group_id, run_ids = await create_run_group([query for _, query in tasks], processor)
+    except Exception:  # noqa: BLE001
+        _logger.warning("Could not create a Parallel.ai task group; starting batch runs individually", exc_info=True)
+        return
+    now = datetime.now(timezone.utc)
+    await asyncio.gather(
+        *(
+            update_research_task(
+                task_id,
+                {"run_id": run_id, "processor": processor, "task_group_id": group_id, "run_created_at": now},
+                durable=True,
+            )
+            for (task_id, _), run_id in zip(tasks, run_ids)
+        )
+    )
 
-async def update_research_task(task_id: str, updates: Dict[str, Any]) -> None:
+
+async def get_research_batch(batch_id: str) -> Optional[Dict[str, Any]]:
+    """Return the batch record with each entry's current task attached."""
+    batch = _in_memory_batches.get(batch_id)
+    if batch is None:
+        try:
+            batch = await get_database()[BATCH_COLLECTION].find_one({"_id": batch_id})
+        except ServerSelectionTimeoutError:
+            return None
+    if batch is None:
+        return None
+    tasks = await get_research_tasks([entry["task_id"] for entry in batch.get("tasks", [])])
+    return {
+        **batch,
+        "tasks": [{**entry, "task": tasks.get(entry["task_id"])} for entry in batch.get("tasks", [])],
+    }
+
+
+async def update_research_task(task_id: str, updates: Dict[str, Any], durable: bool = False) -> None:
+    """Set fields on a task.
+
+    With write-behind enabled the change is buffered unless ``durable`` is
+    set or the task reaches a terminal status.
+    """
     updates["updated_at"] = datetime.now(timezone.utc)
     if task_id in _in_memory_tasks:
         _in_memory_tasks[task_id].update(updates)
+    else:
+        try:
+            if _task_writes is not None:
+                durable = durable or updates.get("status") in TERMINAL_STATUSES
+                await _task_writes.set(task_id, updates, durable=durable)
+            else:
+                await _tasks_collection().update_one({"_id": task_id}, {"$set": updates})
+        except ServerSelectionTimeoutError:
+            _in_memory_tasks[task_id] = {"_id": task_id, **updates, "storage": "memory"}
+    # Stream subscribers are notified in-process instead of polling storage.
+    publish(task_id, dict(updates))
+
+
+async def run_task_flusher() -> None:
+    """Flush buffered task updates on an interval; no-op without write-behind."""
+    if _task_writes is not None:
+        await _task_writes.run()
+
+
+async def flush_task_writes() -> None:
+    if _task_writes is None:
         return
     try:
-        await _tasks_collection().update_one({"_id": task_id}, {"$set": updates})
+        await _task_writes.flush()
     except ServerSelectionTimeoutError:
-        _in_memory_tasks[task_id] = {"_id": task_id, **updates, "storage": "memory"}
+        _logger.warning("Dropped buffered research task updates: MongoDB unavailable")
 
 
 async def run_research_task(task_id: str) -> None:
@@ -84,36 +569,60 @@ async def run_research_task(task_id: str) -> None:
     query = task.get("query") or topic_id
 
     await update_research_task(task_id, {"status": "running"})
+    run_processor = [task.get("processor") or default_processor()]
+
+    async def _record_run(run_id: str, processor: str) -> None:
+        run_processor[0] = processor
+        # Written through so a restart can re-attach instead of paying for a new run.
+        await update_research_task(
+            task_id,
+            # A run created here is not part of any task group.
+            {
+                "run_id": run_id,
+                "processor": processor,
+                "task_group_id": None,
+                "run_created_at": datetime.now(timezone.utc),
+            },
+            durable=True,
+        )
+
+    preview = None
+    if await _wants_preview(topic_id, run_processor[0]):
+        preview = asyncio.create_task(_run_preview(task_id, topic_id, query))
+        _preview_tasks.add(preview)
+        preview.add_done_callback(_preview_tasks.discard)
 
     try:
-        result: ResearchResult = await run_task(query)
-        summary = result.summary or ""
+        result: ResearchResult = await run_task(
+            query,
+            run_id=task.get("run_id"),
+            processor=task.get("processor"),
+            group_id=task.get("task_group_id"),
+            on_created=_record_run,
+            on_status=lambda status: publish(task_id, {"upstream_status": status}),
+        )
+        if preview is not None:
+            # The full result supersedes the preview from here on.
+            preview.cancel()
         sources = [source.model_dump() for source in result.sources]
-        try:
-            await _research_collection().update_one(
-                {"topic_id": topic_id},
-                {
-                    "$set": {
-                        "topic_id": topic_id,
-                        "summary": summary,
-                        "sources": sources,
-                        "generated_at": datetime.now(timezone.utc),
-                    }
-                },
-                upsert=True,
-            )
-        except ServerSelectionTimeoutError:
-            pass
+        generated_at = datetime.now(timezone.utc)
+        record = await _save_research(topic_id, result.summary or "", sources, generated_at)
+        await _cache_result(query, run_processor[0], record["summary"], record["sources"], generated_at)
 
         await update_research_task(
             task_id,
             {
                 "status": "complete",
-                "result": {"summary": summary, "sources": sources},
+                "result": {"summary": record["summary"], "sources": record["sources"]},
                 "error": None,
             },
         )
+    except asyncio.CancelledError:
+        if preview is not None:
+            preview.cancel()
+        raise
     except Exception as exc:  # noqa: BLE001
+        # A preview still in flight is left to finish so the topic has something to show.
         await update_research_task(
             task_id,
             {
@@ -123,13 +632,127 @@ async def run_research_task(task_id: str) -> None:
         )
 
 
-async def get_research_result(topic_id: str) -> Optional[Dict[str, Any]]:
+async def _wants_preview(topic_id: str, processor: str) -> bool:
+    if not PREVIEW_PROCESSOR or PREVIEW_PROCESSOR == processor:
+        return False
+    if PREVIEW_ALWAYS:
+        return True
+    existing = await get_research_result(topic_id)
+    return existing is None or bool(existing.get("preview"))
+
+
+async def _run_preview(task_id: str, topic_id: str, query: str) -> None:
+    """Store a fast-processor result for the topic while the main run is pending."""
     try:
-        return await _research_collection().find_one({"topic_id": topic_id})
+        result = await run_task(query, processor=PREVIEW_PROCESSOR)
+        existing = await get_research_result(topic_id)
+        if existing is not None and not existing.get("preview") and not PREVIEW_ALWAYS:
+            # Full research landed from elsewhere in the meantime.
+            return
+        sources = [source.model_dump() for source in result.sources]
+        await _save_research(topic_id, result.summary or "", sources, datetime.now(timezone.utc), preview=True)
+        await update_research_task(task_id, {"preview_ready": True})
+    except asyncio.CancelledError:
+        raise
+    except Exception:  # noqa: BLE001
+        # The main run is what the task reports on; a failed preview is only logged.
+        _logger.warning("Preview research for task %s failed", task_id, exc_info=True)
+
+
+def _expired_task_ids(tasks: List[Dict[str, Any]], now: datetime) -> List[Any]:
+    """Pick finished tasks that are past the TTL or beyond the per-topic cap."""
+    cutoff = now - timedelta(seconds=TASK_TTL_SECONDS) if TASK_TTL_SECONDS > 0 else None
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    expired: List[Any] = []
+    by_topic: Dict[Any, List[tuple]] = {}
+    for task in tasks:
+        if task.get("status") not in TERMINAL_STATUSES:
+            continue
+        updated_at = as_datetime(task.get("updated_at"))
+        if cutoff is not None and updated_at is not None and updated_at < cutoff:
+            expired.append(task["_id"])
+            continue
+        by_topic.setdefault(task.get("topic_id"), []).append((updated_at or oldest, task["_id"]))
+    if TASK_KEEP_PER_TOPIC > 0:
+        for entries in by_topic.values():
+            entries.sort(key=lambda entry: entry[0], reverse=True)
+            expired.extend(task_id for _, task_id in entries[TASK_KEEP_PER_TOPIC:])
+    return expired
+
+
+async def sweep_research_tasks() -> int:
+    """Delete expired finished tasks, old batch records and stale cache entries."""
+    now = datetime.now(timezone.utc)
+    removed = 0
+    for task_id in _expired_task_ids(list(_in_memory_tasks.values()), now):
+        _in_memory_tasks.pop(task_id, None)
+        removed += 1
+    if TASK_TTL_SECONDS > 0:
+        # Batches kept in memory while storage was down expire like stored ones.
+        cutoff = now - timedelta(seconds=TASK_TTL_SECONDS)
+        for batch_id, batch in list(_in_memory_batches.items()):
+            if batch["created_at"] < cutoff:
+                del _in_memory_batches[batch_id]
+    try:
+        collection = _tasks_collection()
+        tasks = await collection.find({"status": {"$in": list(TERMINAL_STATUSES)}}).to_list(length=None)
+        expired = _expired_task_ids(tasks, now)
+        if expired:
+            result = await collection.delete_many({"_id": {"$in": expired}})
+            removed += result.deleted_count
+            await compact_collection(collection)
+        if TASK_TTL_SECONDS > 0:
+            # Batch records only point at tasks, so they share the task TTL.
+            cutoff = now - timedelta(seconds=TASK_TTL_SECONDS)
+            await get_database()[BATCH_COLLECTION].delete_many({"created_at": {"$lt": cutoff}})
+        if CACHE_TTL_SECONDS > 0:
+            cutoff = now - timedelta(seconds=CACHE_TTL_SECONDS)
+            result = await _cache_collection().delete_many({"generated_at": {"$lt": cutoff}})
+            if result.deleted_count:
+                await compact_collection(_cache_collection())
+    except ServerSelectionTimeoutError:
+        pass
+    return removed
+
+
+async def run_task_sweeper() -> None:
+    """Sweep finished tasks every TASK_SWEEP_INTERVAL_SECONDS until cancelled."""
+    while True:
+        try:
+            removed = await sweep_research_tasks()
+            if removed:
+                _logger.info("Removed %d expired research tasks", removed)
+        except Exception:  # noqa: BLE001
+            _logger.exception("Research task sweep failed")
+        await asyncio.sleep(TASK_SWEEP_INTERVAL_SECONDS)
+
+
+# Enough of a research document to tell whether it has changed.
+RESEARCH_VERSION_PROJECTION = {"topic_id": 1, "generated_at": 1, "preview": 1, "format_version": 1}
+
+
+async def get_research_result(
+    topic_id: str, projection: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    try:
+        return await _research_collection().find_one({"topic_id": topic_id}, projection)
     except ServerSelectionTimeoutError:
         return None
 
 
+async def get_research_results(
+    topic_ids: List[str], projection: Optional[Dict[str, Any]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch research for several topics in one query, keyed by topic_id."""
+    try:
+        docs = await _research_collection().find(
+            {"topic_id": {"$in": topic_ids}}, projection
+        ).to_list(length=None)
+    except ServerSelectionTimeoutError:
+        return {}
+    return {doc["topic_id"]: doc for doc in docs}
+
+
 def normalize_research_summary(summary: str) -> str:
     if not summary:
         return ""
@@ -149,7 +772,7 @@ def normalize_research_summary(summary: str) -> str:
                     # Return directly - unicode_escape corrupts UTF-8 multi-byte chars
                     return extracted
 
-    cleaned = re.sub(r"^TaskRunTextOutput\\(.*?content=", "", summary, flags=re.DOTALL)
+    cleaned = re.sub(r"^TaskRunTextOutput\(.*?content=", "", summary, flags=re.DOTALL)
     return cleaned.strip()
 
 
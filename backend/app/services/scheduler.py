@@ -0,0 +1,116 @@
+import asyncio
+import itertools
+import logging
+import os
+from typing import Any, Dict, List, Optional, Set
+
+from app.services.polling import Histogram
+from app.services.research import PRIORITY_USER, claim_orphaned_tasks, run_research_task
+
+
+_logger = logging.getLogger(__name__)
+
+# Workers only await network I/O, so the default covers a batch of every
+# built-in topic running at once.
+RESEARCH_WORKERS = int(os.getenv("RESEARCH_WORKERS", "8"))
+
+WAIT_SECONDS_BOUNDS = [0.1, 0.5, 1, 5, 15, 30, 60, 300, 900]
+
+
+class ResearchScheduler:
+    """Bounded pool of workers running research tasks from a priority queue.
+
+    Entries are ``(priority, sequence, task_id, enqueued_at)``; lower
+    priorities run first and the sequence keeps FIFO order within one
+    priority. The queue itself is in memory: the task records in storage
+    are what make it durable, since ``start`` re-enqueues any queued or
+    running task left behind by a worker that has gone away.
+    """
+
+    def __init__(self, workers: int = RESEARCH_WORKERS):
+        self.workers = max(1, workers)
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._tasks: List[asyncio.Task] = []
+        self._pending: Set[str] = set()
+        self._running = 0
+        self._wait_seconds = Histogram(WAIT_SECONDS_BOUNDS)
+        self._counts: Dict[str, int] = {"enqueued": 0, "started": 0, "finished": 0, "recovered": 0}
+
+    def submit(self, task_id: str, priority: int = PRIORITY_USER) -> bool:
+        """Queue ``task_id``; returns False if it is already queued or running here."""
+        if task_id in self._pending:
+            return False
+        self._pending.add(task_id)
+        loop = asyncio.get_running_loop()
+        self._queue.put_nowait((priority, next(self._sequence), task_id, loop.time()))
+        self._counts["enqueued"] += 1
+        return True
+
+    async def recover(self) -> int:
+        recovered = 0
+        for task in await claim_orphaned_tasks():
+            if self.submit(task["_id"], task.get("priority", PRIORITY_USER)):
+                recovered += 1
+        self._counts["recovered"] += recovered
+        return recovered
+
+    async def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"research-worker-{index}") for index in range(self.workers)
+        ]
+        recovered = await self.recover()
+        if recovered:
+            _logger.info("Re-enqueued %d orphaned research tasks", recovered)
+
+    async def stop(self) -> None:
+        """Cancel the workers; interrupted and queued tasks are recovered on the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, task_id, enqueued_at = await self._queue.get()
+            self._wait_seconds.observe(loop.time() - enqueued_at)
+            self._running += 1
+            self._counts["started"] += 1
+            try:
+                await run_research_task(task_id)
+            except Exception:  # noqa: BLE001
+                _logger.exception("Research task %s failed", task_id)
+            finally:
+                self._running -= 1
+                self._counts["finished"] += 1
+                self._pending.discard(task_id)
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "running": self._running,
+            "wait_seconds": self._wait_seconds.snapshot(),
+            **self._counts,
+        }
+
+
+_scheduler: Optional[ResearchScheduler] = None
+
+
+def get_scheduler() -> ResearchScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ResearchScheduler()
+    return _scheduler
+
+
+async def start_scheduler() -> None:
+    await get_scheduler().start()
+
+
+async def stop_scheduler() -> None:
+    if _scheduler is not None:
+        await _scheduler.stop()
@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Dict, Set
+
+# In-process fan-out of research task updates to stream subscribers.
+#
+# ``update_research_task`` publishes every change it writes, and the poller
+# publishes upstream run status as it sees it. Each subscriber gets its own
+# queue, so a waiting client costs one idle queue and no storage reads.
+
+_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+
+def publish(task_id: str, event: Dict[str, Any]) -> None:
+    for queue in _subscribers.get(task_id, ()):
+        queue.put_nowait(event)
+
+
+class Subscription:
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.queue: asyncio.Queue = asyncio.Queue()
+        _subscribers.setdefault(task_id, set()).add(self.queue)
+
+    def close(self) -> None:
+        """Stop receiving events; safe to call more than once."""
+        queues = _subscribers.get(self.task_id)
+        if queues is None:
+            return
+        queues.discard(self.queue)
+        if not queues:
+            del _subscribers[self.task_id]
+
+
+def subscribe(task_id: str) -> Subscription:
+    return Subscription(task_id)
+
+
+def subscriber_count() -> int:
+    return sum(len(queues) for queues in _subscribers.values())
@@ -0,0 +1,121 @@
+import re
+
+from app.models.schemas import Source
+
+
+def fix_double_encoded_utf8(text: str) -> str:
+    """Fix double-encoded UTF-8 text (e.g., em dash showing as garbled characters instead of '—').
+    
+    When UTF-8 bytes are incorrectly decoded as Latin-1/CP1252, multi-byte characters become
+    sequences of Latin-1 characters. This function uses regex to find and fix these patterns
+    while preserving valid Unicode characters in the text.
+    """
+    if not text:
+        return text
+    
+    def fix_utf8_sequence(match):
+        """Fix a single corrupted 3-byte UTF-8 sequence."""
+        try:
+            # Get the 3 characters that represent the corrupted UTF-8 bytes
+            chars = match.group(0)
+            # Encode to latin-1 to get the original bytes, then decode as UTF-8
+            return chars.encode('latin-1').decode('utf-8')
+        except (UnicodeDecodeError, UnicodeEncodeError):
+            return match.group(0)  # Return original if fix fails
+    
+    # Pattern to match 3-byte UTF-8 sequences that were decoded as Latin-1
+    # First byte: 0xE0-0xEF (in Latin-1: à-ï, but we focus on common ones)
+    # Second & third bytes: 0x80-0xBF (in Latin-1: control chars + special)
+    # Common pattern for corrupted UTF-8: starts with â (0xE2) followed by €/€ (0x80) and other chars
+    pattern = r'[\u00e0-\u00ef][\u0080-\u00bf][\u0080-\u00bf]'
+    
+    fixed = re.sub(pattern, fix_utf8_sequence, text)
+    
+    # Also fix 2-byte sequences (for characters like ©, ®, etc.)
+    pattern_2byte = r'[\u00c2-\u00df][\u0080-\u00bf]'
+    fixed = re.sub(pattern_2byte, fix_utf8_sequence, fixed)
+    
+    return fixed
+
+def clean_markdown(text: str) -> str:
+    """Remove common markdown formatting symbols and fix encoding issues."""
+    # First, try to fix double-encoded UTF-8
+    text = fix_double_encoded_utf8(text)
+    
+    # Convert escaped newlines to actual newlines for consistent processing
+    text = text.replace('\\n', '\n')
+    
+    # Remove bold markers
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'__(.*?)__', r'\1', text)
+    
+    # Remove header symbols (## Header -> Header)
+    text = re.sub(r'(^|\n)#+\s*', r'\1', text)
+    
+    # Remove horizontal rules
+    text = re.sub(r'(^|\n)---+\s*(\n|$)', r'\1', text)
+    
+    # Remove list markers (* item or - item -> item)
+    text = re.sub(r'(^|\n)\s*[\*\-]\s+', r'\1• ', text)
+    
+    # Remove reference-style link markers [1], [2], etc.
+    text = re.sub(r'\s*\[\d+\]', '', text)
+    
+    # Collapse multiple newlines into double newlines (paragraph breaks)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    
+    # Collapse multiple spaces
+    text = re.sub(r' {2,}', ' ', text)
+    
+    return text.strip()
+
+
+def parse_task_output(text: str) -> tuple[str, list[Source]]:
+    """
+    Attempt to parse the string representation of TaskRunTextOutput.
+    Extracts 'content' for summary and 'citations' for sources.
+    """
+    summary = text
+    sources = []
+    
+    # 1. Extract content='...'
+    # Use triple quotes for regex to avoid escaping issues
+    # Match content='...' followed by either a comma and another kwarg, or the closing paren
+    content_match = re.search(r"""content=(['"])(.*?)\1(?:,\s*[a-zA-Z_]\w*=|\)$)""", text, re.DOTALL)
+    if content_match:
+        raw_content = content_match.group(2)
+        # Use raw content directly - unicode_escape corrupts UTF-8 multi-byte chars
+        summary = raw_content
+    
+    # 2. Extract citations - try multiple patterns to handle different orderings
+    # Find all Citation(...) blocks first
+    citation_blocks = re.findall(r"Citation\([^)]+\)", text)
+    
+    for block in citation_blocks:
+        # Extract url and title from each Citation block (flexible field ordering)
+        url_match = re.search(r"url=['\"]([^'\"]+)['\"]", block)
+        title_match = re.search(r"title=['\"]([^'\"]+)['\"]", block)
+        
+        if url_match:
+            sources.append(Source(
+                title=title_match.group(1) if title_match else "Source",
+                url=url_match.group(1),
+                source_name="", 
+                snippet="",
+                published_at=None
+            ))
+    
+    # Fallback: try the original strict pattern if no sources found
+    if not sources:
+        citation_pattern = re.compile(r"Citation\(url='(.*?)', excerpts=\[.*?\], title='(.*?)'\)")
+        matches = citation_pattern.findall(text)
+        for url, title in matches:
+            sources.append(Source(
+                title=title,
+                url=url,
+                source_name="", 
+                snippet="",
+                published_at=None
+            ))
+        
+    return summary, sources
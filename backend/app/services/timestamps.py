@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+
+def as_datetime(value: Any) -> Optional[datetime]:
+    """Read a stored timestamp as an aware UTC datetime.
+
+    The JSON store hands datetimes back as strings and MongoDB as naive
+    datetimes that are already UTC.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.models.schemas import Topic
+from app.services.timestamps import as_datetime
+
+# The built-in topics and the research query each one is stored under.
+TOPIC_CONFIGS = [
+    {"id": "politics", "label": "US Politics", "emoji": "🇺🇸", "query": "tell me the latest news pertaining to american politics"},
+    {"id": "sports", "label": "Sports", "emoji": "⚽", "query": "tell me the latest news pertaining to american sports"},
+    {"id": "climate", "label": "Climate Change", "emoji": "🌍", "query": "tell me the latest news pertaining to climate change"},
+    {"id": "tech", "label": "Tech & AI", "emoji": "🤖", "query": "tell me the latest news pertaining to tech and ai"},
+    {"id": "economy", "label": "Global Economy", "emoji": "📈", "query": "tell me the latest news pertaining to global economy"},
+    {"id": "health", "label": "Health & Science", "emoji": "🧬", "query": "tell me the latest news pertaining to health and science"},
+]
+TOPIC_ID_MAPPING = {config["id"]: config["query"] for config in TOPIC_CONFIGS}
+
+# Writes made by this worker update the view at once; this bounds how long
+# one made by another worker can go unseen.
+TOPIC_VIEW_MAX_AGE_SECONDS = float(os.getenv("TOPIC_VIEW_MAX_AGE_SECONDS", "30"))
+
+FetchResearch = Callable[[List[str], Dict[str, Any]], Awaitable[Dict[str, Dict[str, Any]]]]
+
+
+class TopicSummaryView:
+    """In-memory ``/topics`` listing, kept in step with research writes.
+
+    ``apply`` is called for every research document saved here, so serving
+    the list costs no storage reads. ``refresh`` reloads all topics with one
+    projected query when the view is empty, invalidated or older than
+    ``TOPIC_VIEW_MAX_AGE_SECONDS``.
+    """
+
+    def __init__(self, configs: List[Dict[str, str]] = TOPIC_CONFIGS):
+        self.configs = configs
+        self._entries: Dict[str, Topic] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def research_ids(self) -> List[str]:
+        return [config["query"] for config in self.configs]
+
+    def apply(self, research_id: str, source_count: int, generated_at: Optional[datetime]) -> None:
+        for config in self.configs:
+            if config["query"] == research_id:
+                self._entries[config["id"]] = Topic(
+                    id=config["id"],
+                    label=config["label"],
+                    emoji=config["emoji"],
+                    article_count=source_count,
+                    last_refreshed_at=generated_at,
+                )
+
+    def load(self, docs: Dict[str, Dict[str, Any]]) -> None:
+        for config in self.configs:
+            doc = docs.get(config["query"]) or {}
+            self.apply(config["query"], doc.get("source_count", 0), as_datetime(doc.get("generated_at")))
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > TOPIC_VIEW_MAX_AGE_SECONDS
+
+    async def refresh(self, fetch: FetchResearch) -> None:
+        if not self.stale():
+            return
+        async with self._lock:
+            # Another request may have reloaded while this one waited.
+            if self.stale():
+                self.load(await fetch(self.research_ids(), {"topic_id": 1, "source_count": 1, "generated_at": 1}))
+
+    def topics(self) -> List[Topic]:
+        return [self._entries[config["id"]] for config in self.configs if config["id"] in self._entries]
+
+
+_view: Optional[TopicSummaryView] = None
+
+
+def get_topic_view() -> TopicSummaryView:
+    global _view
+    if _view is None:
+        _view = TopicSummaryView()
+    return _view
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from pymongo import UpdateOne
+
+
+_logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Coalesces ``$set`` updates per document and flushes them in batches.
+
+    Updates to the same ``_id`` merge in memory until the next flush, which
+    writes every dirty document with a single ``bulk_write``. A flush runs on
+    a timer, when ``max_dirty`` documents are pending, or when a caller asks
+    for a durable write.
+    """
+
+    def __init__(self, get_collection: Callable[[], Any], interval: float, max_dirty: int):
+        self._get_collection = get_collection
+        self.interval = interval
+        self.max_dirty = max_dirty
+        self._dirty: Dict[Any, Dict[str, Any]] = {}
+        # The batch a flush is writing; still pending until the write lands.
+        self._inflight: Dict[Any, Dict[str, Any]] = {}
+        self._flush_lock = asyncio.Lock()
+
+    def pending(self, doc_id: Any) -> Optional[Dict[str, Any]]:
+        """Fields written for ``doc_id`` that have not been flushed yet."""
+        fields = {**self._inflight.get(doc_id, {}), **self._dirty.get(doc_id, {})}
+        return fields or None
+
+    async def set(self, doc_id: Any, fields: Dict[str, Any], durable: bool = False) -> None:
+        self._dirty.setdefault(doc_id, {}).update(fields)
+        if durable or len(self._dirty) >= self.max_dirty:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write every dirty document; returns how many were written."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            batch, self._dirty = self._dirty, {}
+            self._inflight = batch
+            try:
+                await self._get_collection().bulk_write(
+                    [UpdateOne({"_id": doc_id}, {"$set": fields}) for doc_id, fields in batch.items()],
+                    ordered=False,
+                )
+            except BaseException:
+                # Put the batch back under anything written since, then retry later.
+                for doc_id, fields in batch.items():
+                    self._dirty[doc_id] = {**fields, **self._dirty.get(doc_id, {})}
+                raise
+            finally:
+                self._inflight = {}
+            return len(batch)
+
+    async def run(self) -> None:
+        """Flush every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:  # noqa: BLE001
+                _logger.exception("Write-behind flush failed")
@@ -0,0 +1,26 @@
+import pytest
+
+from app.db import sqlite
+from app.db.mongodb import LocalJsonDatabase
+from app.services import research
+
+
+@pytest.fixture
+def local_db(tmp_path, monkeypatch):
+    """An empty local store in ``tmp_path`` serving as the research database.
+
+    Collections are not seeded from the repo's ``local_data.json``, so tests
+    don't depend on whatever data it holds.
+    """
+    db = LocalJsonDatabase(tmp_path, legacy_file=None)
+    monkeypatch.setattr(research, "get_database", lambda: db)
+    return db
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Like ``local_db`` for the SQLite store."""
+    monkeypatch.setattr(sqlite, "LEGACY_DB_FILE", tmp_path / "local_data.json")
+    db = sqlite.SqliteDatabase(tmp_path / "db.sqlite3")
+    monkeypatch.setattr(research, "get_database", lambda: db)
+    return db
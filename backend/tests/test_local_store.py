@@ -0,0 +1,147 @@
+import asyncio
+import os
+
+import pytest
+
+from app.db.mongodb import LocalJsonDatabase, LocalLogStore
+
+
+def _insert(store, *ids):
+    return store.bulk_write([("insert", None, {"_id": i, "n": i}, False) for i in ids])
+
+
+def _ids(store):
+    return sorted(doc["_id"] for doc in store.load())
+
+
+def test_log_replay_rebuilds_state(tmp_path):
+    store = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(store, 1, 2, 3)
+    store.bulk_write([("update_one", {"_id": 2}, {"n": 20}, False), ("delete_many", {"_id": 3}, None, False)])
+
+    assert not (tmp_path / "c.json").exists()
+    fresh = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    assert fresh.find_one({"_id": 2})["n"] == 20
+    assert _ids(fresh) == [1, 2]
+
+
+def test_compact_folds_log_into_snapshot(tmp_path):
+    store = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(store, 1, 2)
+    store.compact()
+
+    assert (tmp_path / "c.json").exists()
+    assert not (tmp_path / "c.log").exists()
+    assert _ids(LocalLogStore(tmp_path / "c.json")) == [1, 2]
+
+
+def test_leftover_compacting_log_is_folded(tmp_path):
+    store = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(store, 1, 2)
+    # A compaction that died after renaming the log.
+    os.replace(tmp_path / "c.log", tmp_path / "c.log.compacting")
+
+    restarted = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(restarted, 3)
+    assert _ids(restarted) == [1, 2, 3]
+    restarted.compact()
+
+    assert not (tmp_path / "c.log.compacting").exists()
+    assert not (tmp_path / "c.log").exists()
+    assert _ids(LocalLogStore(tmp_path / "c.json")) == [1, 2, 3]
+
+
+def test_leftover_compacting_log_triggers_compaction_on_write(tmp_path):
+    store = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(store, *range(6))
+    os.replace(tmp_path / "c.log", tmp_path / "c.log.compacting")
+
+    restarted = LocalLogStore(tmp_path / "c.json", compact_threshold=5)
+    # Call compaction inline instead of on a background thread.
+    restarted._compacting = True
+    _insert(restarted, 6)
+    restarted.compact()
+
+    assert not (tmp_path / "c.log.compacting").exists()
+    assert _ids(LocalLogStore(tmp_path / "c.json")) == list(range(7))
+
+
+def test_failed_fold_is_retried(tmp_path, monkeypatch):
+    store = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(store, 1, 2)
+
+    def disk_full(docs, path):
+        path.write_bytes(b"partial")
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(store, "_write_snapshot", disk_full)
+    with pytest.raises(OSError):
+        store.compact()
+    assert (tmp_path / "c.log.compacting").exists()
+    assert not store._tmp_file().exists()
+    assert _ids(store) == [1, 2]
+
+    monkeypatch.undo()
+    _insert(store, 3)
+    store.compact()
+    assert not (tmp_path / "c.log.compacting").exists()
+    assert _ids(LocalLogStore(tmp_path / "c.json")) == [1, 2, 3]
+
+
+def test_compaction_in_progress_elsewhere_is_left_alone(tmp_path):
+    store = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(store, 1)
+    other = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    with other._compaction_guard() as acquired:
+        assert acquired
+        store.compact()
+    assert (tmp_path / "c.log").exists()
+
+
+def test_pending_snapshot_is_promoted_on_recovery(tmp_path):
+    store = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(store, 1)
+    store.compact()
+    # Crashed after dropping the folded log but before promoting ``.new``.
+    os.replace(tmp_path / "c.json", tmp_path / "c.json.new")
+
+    assert _ids(LocalLogStore(tmp_path / "c.json")) == [1]
+    assert not (tmp_path / "c.json.new").exists()
+
+
+def test_two_stores_on_the_same_files_stay_consistent(tmp_path):
+    first = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    second = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    first.create_index("n", unique=True)
+    second.create_index("n", unique=True)
+
+    _insert(first, 1)
+    _insert(second, 2)
+    assert _ids(first) == [1, 2]
+
+    # A compaction by one store replaces files under the other.
+    first.compact()
+    second.bulk_write([("update_one", {"_id": 1}, {"n": 10}, False)])
+    assert first.find_one({"_id": 1})["n"] == 10
+
+    # Unique indexes see the other store's writes too.
+    with pytest.raises(ValueError):
+        first.bulk_write([("insert", None, {"_id": 3, "n": 2}, False)])
+    assert _ids(second) == [1, 2]
+
+
+def test_failed_batch_is_not_persisted(tmp_path):
+    store = LocalLogStore(tmp_path / "c.json", compact_threshold=1000)
+    _insert(store, 1)
+    with pytest.raises(ValueError):
+        store.bulk_write([("insert", None, {"_id": 2}, False), ("insert", None, {"_id": 1}, False)])
+
+    assert _ids(store) == [1]
+    assert _ids(LocalLogStore(tmp_path / "c.json")) == [1]
+
+
+def test_database_without_legacy_file_starts_empty(tmp_path):
+    async def main():
+        return await LocalJsonDatabase(tmp_path, legacy_file=None)["research_tasks"].find({}).to_list(length=None)
+
+    assert asyncio.run(main()) == []
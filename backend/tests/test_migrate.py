@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.codecs import get_codec
+from app.db.migrate import migrate
+from app.db.mongodb import LocalLogStore
+
+
+def test_migrate_to_msgpack_converts_timestamps(tmp_path):
+    pytest.importorskip("msgpack")
+    source = LocalLogStore(tmp_path / "research_tasks.json", compact_threshold=1000)
+    source.bulk_write(
+        [
+            (
+                "insert",
+                None,
+                {"_id": "old", "created_at": "2026-01-01T12:00:00+00:00", "updated_at": "2026-01-01 12:00:00"},
+                False,
+            ),
+            ("insert", None, {"_id": "new", "created_at": datetime(2026, 1, 2, tzinfo=timezone.utc), "note": "2026-01-03"}, False),
+        ]
+    )
+
+    migrate("json", "msgpack", tmp_path, legacy_file=None, force=False)
+
+    target = LocalLogStore(tmp_path / "research_tasks.msgpack", codec=get_codec("msgpack"))
+    docs = {doc["_id"]: doc for doc in target.load()}
+    assert docs["old"]["created_at"] == datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    assert docs["old"]["updated_at"] == datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    assert docs["new"]["created_at"] == datetime(2026, 1, 2, tzinfo=timezone.utc)
+    # Only known timestamp fields are converted.
+    assert docs["new"]["note"] == "2026-01-03"
+    ordered = target.find({}, sort=[("created_at", -1)])
+    assert [doc["_id"] for doc in ordered] == ["new", "old"]
+
+
+def test_migrate_between_json_codecs_keeps_strings(tmp_path):
+    pytest.importorskip("orjson")
+    source = LocalLogStore(tmp_path / "items.json", compact_threshold=1000)
+    source.bulk_write([("insert", None, {"_id": "a", "created_at": "2026-01-01T12:00:00+00:00"}, False)])
+
+    migrate("json", "orjson", tmp_path, legacy_file=None, force=False)
+
+    target = LocalLogStore(tmp_path / "items.json", codec=get_codec("orjson"))
+    assert target.find_one({"_id": "a"})["created_at"] == "2026-01-01T12:00:00+00:00"
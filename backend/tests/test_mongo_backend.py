@@ -0,0 +1,48 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+AsyncMongoMockClient = mongomock_motor.AsyncMongoMockClient
+
+from app.db import mongodb
+from app.services import research
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    # DB_BACKEND=mongo through the Motor API, against an in-process stand-in.
+    monkeypatch.setenv("DB_BACKEND", "mongo")
+    monkeypatch.setenv("MONGODB_URI", "mongomock://localhost")
+    monkeypatch.setenv("MONGODB_DB", "test")
+    monkeypatch.setattr(mongodb, "_client", None)
+    yield
+    mongodb.close_database()
+
+
+def test_research_flow_through_motor(mongo):
+    sources = [{"title": f"s{index}", "url": f"https://example.com/{index}"} for index in range(5)]
+
+    async def main():
+        await research.ensure_indexes()
+        task, created = await research.start_research_task("politics", "politics query", force=True)
+        attached, attached_created = await research.start_research_task("politics", "politics query")
+        await research.update_research_task(task["_id"], {"status": "running"})
+        running = await research.get_research_task(task["_id"])
+        await research._save_research("politics", "Summary.", sources, datetime(2026, 1, 1, tzinfo=timezone.utc))
+        page = await research.get_research_result(
+            "politics", {"topic_id": 1, "source_count": 1, "sources": {"$slice": [1, 2]}}
+        )
+        assert isinstance(mongodb._client, AsyncMongoMockClient)
+        indexes = await mongodb.get_database()[research.RESEARCH_COLLECTION].index_information()
+        return task, created, attached, attached_created, running, page, indexes
+
+    task, created, attached, attached_created, running, page, indexes = asyncio.run(main())
+    assert created and not attached_created
+    assert attached["_id"] == task["_id"]
+    assert running["status"] == "running"
+    assert page["source_count"] == 5
+    assert [source["url"] for source in page["sources"]] == ["https://example.com/1", "https://example.com/2"]
+    assert "summary" not in page
+    assert any(spec["key"] == [("topic_id", 1)] and spec.get("unique") for spec in indexes.values())
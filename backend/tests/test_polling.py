@@ -0,0 +1,16 @@
+from app.services.polling import EXPECTED_SECONDS, policy_for
+
+
+def test_expected_seconds_override_is_per_processor(monkeypatch):
+    monkeypatch.setenv("PARALLEL_EXPECTED_SECONDS_ULTRA", "600")
+
+    assert policy_for("ultra").expected_seconds == 600
+    # The preview processor keeps its own schedule.
+    assert policy_for("lite").expected_seconds == EXPECTED_SECONDS["lite"]
+
+
+def test_preview_processor_can_be_tuned_alone(monkeypatch):
+    monkeypatch.setenv("PARALLEL_EXPECTED_SECONDS_LITE", "5")
+
+    assert policy_for("lite").expected_seconds == 5
+    assert policy_for("ultra").expected_seconds == EXPECTED_SECONDS["ultra"]
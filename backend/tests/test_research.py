@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.services import research
+from app.services.write_behind import WriteBehindBuffer
+
+
+def test_topic_lock_serializes_and_is_dropped_when_unused():
+    order = []
+
+    async def hold(name):
+        async with research._topic_lock("politics"):
+            order.append(f"{name}-in")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}-out")
+
+    async def main():
+        await asyncio.gather(hold("a"), hold("b"), hold("c"))
+
+    asyncio.run(main())
+    assert order == ["a-in", "a-out", "b-in", "b-out", "c-in", "c-out"]
+    assert "politics" not in research._topic_locks
+    assert "politics" not in research._topic_lock_users
+
+
+def test_topic_lock_is_dropped_when_waiter_is_cancelled():
+    async def main():
+        async with research._topic_lock("sports"):
+            waiter = asyncio.create_task(research._topic_lock("sports").__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(main())
+    assert "sports" not in research._topic_locks
+
+
+def test_batch_runs_are_created_in_one_task_group(local_db, monkeypatch):
+    groups = []
+
+    async def create_run_group(queries, processor=None):
+        groups.append(list(queries))
+        return "group-1", [f"run-{index}" for index in range(len(queries))]
+
+    monkeypatch.setattr(research, "create_run_group", create_run_group)
+
+    async def main():
+        _, started = await research.start_research_batch([("a", "query a", False), ("b", "query b", False)])
+        return await research.get_research_tasks([task["_id"] for task, _ in started])
+
+    tasks = asyncio.run(main())
+    assert groups == [["query a", "query b"]]
+    assert sorted((task["query"], task["run_id"], task["task_group_id"]) for task in tasks.values()) == [
+        ("query a", "run-0", "group-1"),
+        ("query b", "run-1", "group-1"),
+    ]
+
+
+def test_find_active_task_overlays_buffered_status(local_db, monkeypatch):
+    buffer = WriteBehindBuffer(research._tasks_collection, interval=60, max_dirty=100)
+    monkeypatch.setattr(research, "_task_writes", buffer)
+
+    async def main():
+        task_id = await research.create_research_task("politics", "query")
+        await research.update_research_task(task_id, {"status": "running"})
+        return task_id, await research.find_active_task("politics")
+
+    task_id, task = asyncio.run(main())
+    assert task["_id"] == task_id
+    assert task["status"] == "running"
+
+
+def test_claim_orphaned_tasks_skips_tasks_finished_in_the_buffer(local_db, monkeypatch):
+    buffer = WriteBehindBuffer(research._tasks_collection, interval=60, max_dirty=100)
+    monkeypatch.setattr(research, "_task_writes", buffer)
+
+    async def main():
+        done = await research.create_research_task("politics", "query")
+        orphan = await research.create_research_task("sports", "query")
+        # Finished here, but only the buffer knows it yet.
+        await buffer.set(done, {"status": "complete"})
+        return orphan, await research.claim_orphaned_tasks()
+
+    orphan, claimed = asyncio.run(main())
+    # Tasks owned by this process's pid count as a previous process's orphans.
+    assert [task["_id"] for task in claimed] == [orphan]
+
+
+def test_ensure_indexes_tolerates_duplicate_research(sqlite_db):
+
+    async def main():
+        collection = sqlite_db[research.RESEARCH_COLLECTION]
+        await collection.insert_many([{"topic_id": "politics", "_id": "a"}, {"topic_id": "politics", "_id": "b"}])
+        await research.ensure_indexes()
+        return await collection.find({"topic_id": "politics"}).to_list(length=None)
+
+    assert len(asyncio.run(main())) == 2
+
+
+def test_sweep_expires_in_memory_batches(local_db, monkeypatch):
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(seconds=research.TASK_TTL_SECONDS + 60)
+    monkeypatch.setattr(
+        research,
+        "_in_memory_batches",
+        {"old": {"_id": "old", "created_at": old}, "new": {"_id": "new", "created_at": now}},
+    )
+
+    asyncio.run(research.sweep_research_tasks())
+    assert list(research._in_memory_batches) == ["new"]
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from starlette.requests import ClientDisconnect
+
+from app.routers import research as research_router
+from app.services import task_events
+
+
+@pytest.fixture
+def app(monkeypatch):
+    async def get_research_task(task_id):
+        return {"_id": task_id, "status": "running", "owner": research_router.WORKER_ID}
+
+    monkeypatch.setattr(research_router, "get_research_task", get_research_task)
+    app = FastAPI()
+    app.include_router(research_router.router)
+    return app
+
+
+def _scope(spec_version):
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": spec_version},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/research/status/t1/stream",
+        "raw_path": b"/research/status/t1/stream",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+
+
+def test_stream_unsubscribes_when_send_fails_on_disconnect(app):
+    # ASGI 2.4 servers raise OSError from send() once the client is gone.
+    bodies = []
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+            if len(bodies) > 1:
+                raise OSError("client went away")
+
+    async def main():
+        request = asyncio.create_task(app(_scope("2.4"), receive, send))
+        while not bodies:
+            await asyncio.sleep(0)
+        assert task_events.subscriber_count() == 1
+        task_events.publish("t1", {"upstream_status": "running"})
+        with pytest.raises(ClientDisconnect):
+            await request
+        return task_events.subscriber_count()
+
+    assert asyncio.run(main()) == 0
+
+
+def test_stream_unsubscribes_when_client_disconnects(app):
+    # Before ASGI 2.4 Starlette listens for http.disconnect and cancels the stream.
+    bodies = []
+    disconnected = None
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+
+    async def main():
+        nonlocal disconnected
+        disconnected = asyncio.Event()
+        request = asyncio.create_task(app(_scope("2.3"), receive, send))
+        while not bodies:
+            await asyncio.sleep(0)
+        assert task_events.subscriber_count() == 1
+        disconnected.set()
+        await request
+        return task_events.subscriber_count()
+
+    assert asyncio.run(main()) == 0
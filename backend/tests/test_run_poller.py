@@ -0,0 +1,179 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from parallel import NotFoundError
+
+from app.services import parallel_ai
+from app.services.polling import PollPolicy
+
+FAST = PollPolicy(expected_seconds=0.0, min_interval=0.01, max_interval=0.01, jitter=0.0)
+
+
+def _not_found(run_id):
+    request = httpx.Request("GET", f"https://api.parallel.ai/v1/tasks/runs/{run_id}")
+    return NotFoundError("run not found", response=httpx.Response(404, request=request), body=None)
+
+
+class FakeTaskRun:
+    """``client.task_run`` that walks each run through a list of statuses."""
+
+    def __init__(self, statuses):
+        self.statuses = {run_id: list(steps) for run_id, steps in statuses.items()}
+        self.created = []
+
+    async def create(self, input, processor, task_spec):
+        run_id = f"new-{len(self.created)}"
+        self.created.append(run_id)
+        self.statuses[run_id] = ["running", "completed"]
+        return SimpleNamespace(run_id=run_id)
+
+    async def retrieve(self, run_id):
+        if run_id not in self.statuses:
+            raise _not_found(run_id)
+        steps = self.statuses[run_id]
+        status = steps.pop(0) if len(steps) > 1 else steps[0]
+        return SimpleNamespace(run_id=run_id, status=status, error="boom")
+
+    async def result(self, run_id, api_timeout=None):
+        return SimpleNamespace(output={"summary": f"summary of {run_id}", "sources": []})
+
+
+class FakeTaskGroup:
+    """``client.task_group`` streaming the state of its runs from ``task_run``."""
+
+    def __init__(self, task_run, groups):
+        self.task_run = task_run
+        self.groups = groups
+        self.get_runs_calls = 0
+
+    async def get_runs(self, task_group_id, timeout=None):
+        if task_group_id not in self.groups:
+            raise _not_found(task_group_id)
+        self.get_runs_calls += 1
+        events = [
+            SimpleNamespace(type="task_run.state", run=await self.task_run.retrieve(run_id))
+            for run_id in self.groups[task_group_id]
+        ]
+
+        async def stream():
+            for event in events:
+                yield event
+
+        return stream()
+
+
+class FakeClient:
+    def __init__(self, statuses=None, groups=None):
+        self.task_run = FakeTaskRun(statuses or {})
+        self.task_group = FakeTaskGroup(self.task_run, groups or {})
+
+    async def close(self):
+        pass
+
+
+async def _wait(poller, run_id, timeout=1.0, on_status=None):
+    try:
+        return await poller.wait(run_id, "lite", FAST, timeout, on_status)
+    finally:
+        await poller.close()
+
+
+def test_poller_resolves_completed_run():
+    seen = []
+
+    async def main():
+        poller = parallel_ai._RunPoller(FakeClient({"r1": ["queued", "running", "completed"]}))
+        return await _wait(poller, "r1", on_status=seen.append)
+
+    result = asyncio.run(main())
+    assert result.output["summary"] == "summary of r1"
+    assert seen == ["queued", "running", "completed"]
+
+
+def test_poller_fails_failed_run():
+    async def main():
+        poller = parallel_ai._RunPoller(FakeClient({"r1": ["running", "failed"]}))
+        return await _wait(poller, "r1")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(main())
+
+
+def test_poller_times_out():
+    async def main():
+        poller = parallel_ai._RunPoller(FakeClient({"r1": ["running"]}))
+        return await _wait(poller, "r1", timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(main())
+
+
+def test_poller_shares_one_run_between_waiters():
+    async def main():
+        poller = parallel_ai._RunPoller(FakeClient({"r1": ["running", "completed"]}))
+        try:
+            return await asyncio.gather(
+                poller.wait("r1", "lite", FAST, 1.0), poller.wait("r1", "lite", FAST, 1.0)
+            )
+        finally:
+            await poller.close()
+
+    first, second = asyncio.run(main())
+    assert first is second
+
+
+def test_poller_checks_group_runs_together():
+    client = FakeClient(
+        {"r1": ["running", "completed"], "r2": ["running", "running", "completed"]}, groups={"g": ["r1", "r2"]}
+    )
+
+    async def main():
+        poller = parallel_ai._RunPoller(client)
+        try:
+            return await asyncio.gather(
+                poller.wait("r1", "lite", FAST, 1.0, group_id="g"), poller.wait("r2", "lite", FAST, 1.0, group_id="g")
+            )
+        finally:
+            await poller.close()
+
+    first, second = asyncio.run(main())
+    assert first.output["summary"] == "summary of r1"
+    assert second.output["summary"] == "summary of r2"
+    assert client.task_group.get_runs_calls == 3
+
+
+def test_poller_polls_runs_individually_when_group_is_gone():
+    async def main():
+        poller = parallel_ai._RunPoller(FakeClient({"r1": ["running", "completed"]}))
+        try:
+            return await poller.wait("r1", "lite", FAST, 1.0, group_id="missing")
+        finally:
+            await poller.close()
+
+    assert asyncio.run(main()).output["summary"] == "summary of r1"
+
+
+def test_run_task_starts_new_run_when_resumed_run_is_gone(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(parallel_ai, "_client", client)
+    monkeypatch.setattr(parallel_ai, "_poller", None)
+    # Poll from the start instead of waiting for the processor's expected run time.
+    monkeypatch.setenv("PARALLEL_EXPECTED_SECONDS_LITE", "0")
+    created = []
+
+    async def on_created(run_id, processor):
+        created.append((run_id, processor))
+
+    async def main():
+        try:
+            return await parallel_ai.run_task(
+                "query", run_id="gone", processor="lite", poll_interval=0.01, timeout_seconds=1.0, on_created=on_created
+            )
+        finally:
+            await parallel_ai.close_poller()
+
+    result = asyncio.run(main())
+    assert result.summary == "summary of new-0"
+    assert created == [("new-0", "lite")]
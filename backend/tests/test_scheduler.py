@@ -0,0 +1,72 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app.services import research, scheduler
+from app.services.research import PRIORITY_SCHEDULED, PRIORITY_USER
+
+
+def test_scheduler_runs_by_priority_then_fifo(monkeypatch):
+    ran = []
+
+    async def run_research_task(task_id):
+        ran.append(task_id)
+
+    async def claim_orphaned_tasks():
+        return []
+
+    monkeypatch.setattr(scheduler, "run_research_task", run_research_task)
+    monkeypatch.setattr(scheduler, "claim_orphaned_tasks", claim_orphaned_tasks)
+
+    async def main():
+        pool = scheduler.ResearchScheduler(workers=1)
+        pool.submit("scheduled-1", PRIORITY_SCHEDULED)
+        pool.submit("user-1", PRIORITY_USER)
+        pool.submit("scheduled-2", PRIORITY_SCHEDULED)
+        pool.submit("user-2", PRIORITY_USER)
+        assert not pool.submit("user-1", PRIORITY_USER)
+        await pool.start()
+        await pool._queue.join()
+        await pool.stop()
+        return pool.stats()
+
+    stats = asyncio.run(main())
+    assert ran == ["user-1", "user-2", "scheduled-1", "scheduled-2"]
+    assert stats["enqueued"] == stats["finished"] == 4
+
+
+def _dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_claim_orphaned_tasks(local_db):
+    host = socket.gethostname()
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(seconds=research.TASK_STALE_SECONDS + 60)
+    tasks = [
+        {"_id": "dead", "status": "running", "owner": f"{host}:{_dead_pid()}", "updated_at": now},
+        {"_id": "live", "status": "running", "owner": f"{host}:{os.getppid()}", "updated_at": now},
+        {"_id": "remote-stale", "status": "queued", "owner": "elsewhere:1", "updated_at": old},
+        {"_id": "remote-fresh", "status": "running", "owner": "elsewhere:2", "updated_at": now},
+        {"_id": "done", "status": "completed", "owner": f"{host}:{_dead_pid()}", "updated_at": old},
+    ]
+    for index, task in enumerate(tasks):
+        task["created_at"] = now + timedelta(seconds=index)
+
+    async def main():
+        collection = local_db[research.TASK_COLLECTION]
+        await collection.insert_many(tasks)
+        claimed = await research.claim_orphaned_tasks()
+        stored = await collection.find_one({"_id": "dead"})
+        return claimed, stored
+
+    claimed, stored = asyncio.run(main())
+    assert [task["_id"] for task in claimed] == ["dead", "remote-stale"]
+    assert all(task["owner"] == research.WORKER_ID and task["status"] == "queued" for task in claimed)
+    assert stored["owner"] == research.WORKER_ID
+    assert stored["status"] == "queued"
@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from pymongo import DeleteMany, InsertOne, UpdateOne
+
+from app.db.query import matches
+from app.db.sqlite import SqliteCollection, _where
+
+
+def _collection(tmp_path):
+    return SqliteCollection("items", tmp_path / "db.sqlite3")
+
+
+async def _ids(collection):
+    return sorted(doc["_id"] for doc in await collection.find({}).to_list(length=None))
+
+
+def test_bulk_write_applies_batch(tmp_path):
+    async def scenario():
+        collection = _collection(tmp_path)
+        result = await collection.bulk_write(
+            [
+                InsertOne({"_id": "a", "n": 1}),
+                InsertOne({"_id": "b", "n": 2}),
+                UpdateOne({"_id": "a"}, {"$set": {"n": 10}}),
+                UpdateOne({"_id": "c"}, {"$set": {"n": 3}}, upsert=True),
+                DeleteMany({"_id": "b"}),
+            ]
+        )
+        assert (result.matched_count, result.deleted_count) == (1, 1)
+        assert result.upserted_ids == {3: "c"}
+        assert await _ids(collection) == ["a", "c"]
+        assert (await collection.find_one({"_id": "a"}))["n"] == 10
+
+    asyncio.run(scenario())
+
+
+def test_bulk_write_rolls_back_on_error(tmp_path):
+    async def scenario():
+        collection = _collection(tmp_path)
+        await collection.insert_one({"_id": "a", "n": 1})
+        with pytest.raises(ValueError):
+            await collection.bulk_write(
+                [
+                    UpdateOne({"_id": "a"}, {"$set": {"n": 10}}),
+                    InsertOne({"_id": "b"}),
+                    InsertOne({"_id": "a"}),
+                ]
+            )
+        assert await _ids(collection) == ["a"]
+        assert (await collection.find_one({"_id": "a"}))["n"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_unique_index_violation_rolls_back(tmp_path):
+    async def scenario():
+        collection = _collection(tmp_path)
+        await collection.create_index("email", unique=True)
+        await collection.insert_one({"_id": "a", "email": "x"})
+        with pytest.raises(ValueError):
+            await collection.insert_many([{"_id": "b", "email": "y"}, {"_id": "c", "email": "x"}])
+        assert await _ids(collection) == ["a"]
+
+    asyncio.run(scenario())
+
+
+_DOCS = [
+    {"_id": "a", "n": 1, "s": "x", "when": "2026-01-01 12:00:00+00:00"},
+    {"_id": "b", "n": 2.5, "s": "y", "when": "2026-01-03T12:00:00+00:00"},
+    {"_id": "c", "n": "3", "s": None, "when": "2026-01-05 00:30:00+02:00"},
+    {"_id": "d", "n": True, "when": "2026-01-09 12:00:00.250000+00:00"},
+    {"_id": "e", "s": "x", "n": [1, 2]},
+]
+
+_FILTERS = [
+    {"_id": {"$in": ["a", "c", "z"]}},
+    {"n": {"$in": [1, "3"]}},
+    {"s": {"$in": [None]}},
+    {"s": {"$in": []}},
+    {"s": {"$ne": "x"}},
+    {"s": {"$ne": None}},
+    {"n": {"$gt": 1}},
+    {"n": {"$lte": 2.5, "$gte": 1}},
+    {"s": {"$lt": "y"}},
+    {"when": {"$lt": datetime(2026, 1, 4, 22, 0, tzinfo=timezone.utc)}},
+    {"when": {"$lt": datetime(2026, 1, 4, 23, 0, tzinfo=timezone.utc)}},
+    {"when": {"$gte": datetime(2026, 1, 3, 12, 0, tzinfo=timezone.utc)}},
+    {"s": "x", "n": {"$nin": [1]}},
+]
+
+
+@pytest.mark.parametrize("filter", _FILTERS)
+def test_operator_filters_match_python(tmp_path, filter):
+    async def scenario():
+        collection = _collection(tmp_path)
+        await collection.insert_many([dict(doc) for doc in _DOCS])
+        await collection.create_index("n")
+        return sorted(doc["_id"] for doc in await collection.find(filter).to_list(length=None))
+
+    assert asyncio.run(scenario()) == sorted(doc["_id"] for doc in _DOCS if matches(doc, filter))
+
+
+@pytest.mark.parametrize(
+    "filter, index",
+    [
+        ({"_id": {"$in": ["a", "b"]}}, "sqlite_autoindex_items_1"),
+        ({"status": {"$in": ["queued", "running"]}}, "ix_items_status"),
+        ({"created_at": {"$lt": datetime(2026, 1, 1, tzinfo=timezone.utc)}}, "ix_items_created_at"),
+    ],
+)
+def test_operator_filters_use_indexes(tmp_path, filter, index):
+    collection = _collection(tmp_path)
+    collection._create_index("status", False)
+    collection._create_index("created_at", False)
+    where, params, _ = _where(filter)
+    plan = collection._conn().execute(
+        f"EXPLAIN QUERY PLAN SELECT id, doc FROM {collection._table} WHERE {where}", params
+    ).fetchall()
+    assert any(index in row[-1] for row in plan), plan
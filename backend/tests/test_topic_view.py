@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+
+from app.services.topic_view import TopicSummaryView
+
+CONFIGS = [
+    {"id": "a", "label": "A", "emoji": "a", "query": "query a"},
+    {"id": "b", "label": "B", "emoji": "b", "query": "query b"},
+    {"id": "c", "label": "C", "emoji": "c", "query": "query c"},
+]
+
+
+def test_load_normalizes_generated_at_to_aware_utc():
+    view = TopicSummaryView(CONFIGS)
+    view.load({
+        # MongoDB returns naive UTC datetimes, the JSON store strings.
+        "query a": {"source_count": 2, "generated_at": datetime(2026, 1, 1, 12, 0)},
+        "query b": {"source_count": 3, "generated_at": "2026-01-02T12:00:00+00:00"},
+    })
+    view.apply("query c", 4, datetime(2026, 1, 3, 12, 0, tzinfo=timezone.utc))
+
+    refreshed = {topic.id: topic.last_refreshed_at for topic in view.topics()}
+    assert refreshed == {
+        "a": datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc),
+        "b": datetime(2026, 1, 2, 12, 0, tzinfo=timezone.utc),
+        "c": datetime(2026, 1, 3, 12, 0, tzinfo=timezone.utc),
+    }
+    assert max(refreshed.values()) == refreshed["c"]
+
+
+def test_load_without_research_leaves_timestamp_empty():
+    view = TopicSummaryView(CONFIGS)
+    view.load({})
+    assert [topic.last_refreshed_at for topic in view.topics()] == [None, None, None]
+
+
+def test_list_topics_with_mixed_naive_and_aware_timestamps(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.routers import topics
+
+    view = TopicSummaryView(CONFIGS)
+    view.apply("query a", 1, datetime(2026, 1, 1, 12, 0))
+    view.apply("query b", 1, datetime(2026, 1, 2, 12, 0, tzinfo=timezone.utc))
+    view._loaded_at = float("inf")
+    monkeypatch.setattr(topics, "get_topic_view", lambda: view)
+    app = FastAPI()
+    app.include_router(topics.router)
+
+    response = TestClient(app).get("/topics")
+    assert response.status_code == 200
+    assert response.headers["Last-Modified"] == "Fri, 02 Jan 2026 12:00:00 GMT"
@@ -0,0 +1,54 @@
+import asyncio
+
+from app.services.write_behind import WriteBehindBuffer
+
+
+class SlowCollection:
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.fail = False
+        self.writes = []
+
+    async def bulk_write(self, requests, ordered=True):
+        self.started.set()
+        await self.release.wait()
+        if self.fail:
+            raise OSError("write failed")
+        self.writes.extend(requests)
+
+
+def test_pending_includes_batch_being_flushed():
+    async def main():
+        collection = SlowCollection()
+        buffer = WriteBehindBuffer(lambda: collection, interval=60, max_dirty=100)
+        await buffer.set("t1", {"status": "running", "upstream_status": "queued"})
+        flush = asyncio.create_task(buffer.flush())
+        await collection.started.wait()
+        # Written while the flush is in flight; newer fields win.
+        await buffer.set("t1", {"upstream_status": "running"})
+        during = buffer.pending("t1")
+        collection.release.set()
+        await flush
+        return during, buffer.pending("t1"), len(collection.writes)
+
+    during, after, written = asyncio.run(main())
+    assert during == {"status": "running", "upstream_status": "running"}
+    assert after == {"upstream_status": "running"}
+    assert written == 1
+
+
+def test_failed_flush_keeps_fields_pending():
+    async def main():
+        collection = SlowCollection()
+        collection.fail = True
+        collection.release.set()
+        buffer = WriteBehindBuffer(lambda: collection, interval=60, max_dirty=100)
+        await buffer.set("t1", {"status": "running"})
+        try:
+            await buffer.flush()
+        except OSError:
+            pass
+        return buffer.pending("t1")
+
+    assert asyncio.run(main()) == {"status": "running"}
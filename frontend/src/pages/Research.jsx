@@ -1,4 +1,4 @@
-import { useCallback, useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import axios from "axios";
 
 import { API_URL } from "../config.js";
@@ -10,6 +10,10 @@ const Research = () => {
   const [error, setError] = useState("");
   const [result, setResult] = useState(null);
   const [loadingLatest, setLoadingLatest] = useState(false);
+  const [isPreview, setIsPreview] = useState(false);
+  // Topic of the running task, and whether its preview has been fetched.
+  const taskTopic = useRef("");
+  const previewLoaded = useRef(false);
 
   const statusLabel = useMemo(() => {
     if (status === "idle") return "Idle";
@@ -20,19 +24,44 @@ const Research = () => {
     return status;
   }, [status]);
 
+  const applyStatus = useCallback((data) => {
+    const nextStatus = data?.status ?? "unknown";
+    setStatus(nextStatus);
+
+    if (nextStatus === "complete") {
+      setResult(data?.result ?? null);
+      setIsPreview(false);
+      return true;
+    }
+
+    if (data?.preview_ready && !previewLoaded.current) {
+      // Show the quick preview while the full run continues.
+      previewLoaded.current = true;
+      axios
+        .get(`${API_URL}/research/${taskTopic.current}`)
+        .then((response) => {
+          if (!response.data?.preview) return;
+          setResult({
+            summary: response.data?.summary ?? "",
+            sources: response.data?.sources ?? [],
+          });
+          setIsPreview(true);
+        })
+        .catch(() => {});
+    }
+
+    if (nextStatus === "error") {
+      setError(data?.error ?? "Research failed.");
+      return true;
+    }
+
+    return false;
+  }, []);
+
   const pollStatus = useCallback(async (id) => {
     try {
       const response = await axios.get(`${API_URL}/research/status/${id}`);
-      const nextStatus = response.data?.status ?? "unknown";
-      setStatus(nextStatus);
-
-      if (nextStatus === "complete") {
-        setResult(response.data?.result ?? null);
-        return true;
-      }
-
-      if (nextStatus === "error") {
-        setError(response.data?.error ?? "Research failed.");
+      if (applyStatus(response.data)) {
         return true;
       }
     } catch (pollError) {
@@ -41,7 +70,7 @@ const Research = () => {
     }
 
     return false;
-  }, []);
+  }, [applyStatus]);
 
   const startResearch = async (event) => {
     event.preventDefault();
@@ -52,10 +81,13 @@ const Research = () => {
 
     setError("");
     setResult(null);
+    setIsPreview(false);
     setStatus("queued");
 
     try {
       const topicValue = topic.trim();
+      taskTopic.current = topicValue;
+      previewLoaded.current = false;
       const response = await axios.post(`${API_URL}/research/refresh`, {
         topic_id: topicValue,
         query: topicValue,
@@ -93,6 +125,7 @@ const Research = () => {
         summary: response.data?.summary ?? "",
         sources: response.data?.sources ?? [],
       });
+      setIsPreview(Boolean(response.data?.preview));
     } catch (fetchError) {
       setError(
         fetchError?.response?.data?.detail ||
@@ -108,19 +141,41 @@ const Research = () => {
     if (!taskId) return undefined;
 
     let cancelled = false;
-    const interval = setInterval(async () => {
-      if (cancelled) return;
-      const done = await pollStatus(taskId);
-      if (done) {
-        clearInterval(interval);
-      }
-    }, 1500);
+    let interval = null;
+    let stream = null;
+
+    const startPolling = () => {
+      interval = setInterval(async () => {
+        if (cancelled) return;
+        const done = await pollStatus(taskId);
+        if (done) {
+          clearInterval(interval);
+        }
+      }, 1500);
+    };
+
+    if (typeof EventSource === "undefined") {
+      startPolling();
+    } else {
+      // The server pushes each status change; fall back to polling if the stream drops.
+      stream = new EventSource(`${API_URL}/research/status/${taskId}/stream`);
+      stream.addEventListener("status", (event) => {
+        if (applyStatus(JSON.parse(event.data))) {
+          stream.close();
+        }
+      });
+      stream.onerror = () => {
+        stream.close();
+        if (!cancelled) startPolling();
+      };
+    }
 
     return () => {
       cancelled = true;
-      clearInterval(interval);
+      if (stream) stream.close();
+      if (interval) clearInterval(interval);
     };
-  }, [pollStatus, taskId]);
+  }, [applyStatus, pollStatus, taskId]);
 
   const sources = result?.sources ?? [];
 
@@ -185,6 +240,11 @@ const Research = () => {
         }}
       >
         <h3 style={{ marginTop: 0 }}>Summary</h3>
+        {isPreview ? (
+          <p style={{ color: "#6b7280", fontSize: 14 }}>
+            Preview from a quick search; the full research replaces it when ready.
+          </p>
+        ) : null}
         <p style={{ color: "#1f2937" }}>
           {result?.summary ? result.summary : "No summary yet."}
         </p>
@@ -5,18 +5,28 @@ import httpx
 
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 TOPIC_ID = os.getenv("TOPIC_ID", "")
+# Comma-separated topic ids refreshed together through /research/refresh-batch.
+TOPIC_IDS = [topic.strip() for topic in os.getenv("TOPIC_IDS", "").split(",") if topic.strip()]
+FORCE = os.getenv("FORCE", "").strip().lower() in {"1", "true", "yes"}
 
 
 async def main() -> None:
-    if not TOPIC_ID:
-        raise SystemExit("TOPIC_ID is required")
+    if not TOPIC_ID and not TOPIC_IDS:
+        raise SystemExit("TOPIC_ID or TOPIC_IDS is required")
 
     async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{API_URL}/research/refresh",
-            json={"topic_id": TOPIC_ID},
-            timeout=30,
-        )
+        if TOPIC_IDS:
+            response = await client.post(
+                f"{API_URL}/research/refresh-batch",
+                json={"topics": TOPIC_IDS, "force": FORCE},
+                timeout=30,
+            )
+        else:
+            response = await client.post(
+                f"{API_URL}/research/refresh",
+                json={"topic_id": TOPIC_ID, "force": FORCE},
+                timeout=30,
+            )
         response.raise_for_status()
         print(response.json())
 